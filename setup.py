@@ -29,6 +29,8 @@ OPTIONS = {
     },
     'packages': find_packages(include=['src*']) + [
         'uvicorn',
+        'uvloop',
+        'httptools',
         'fastapi',
         'webview',
         'pystray',
@@ -41,9 +43,11 @@ OPTIONS = {
         'uvicorn.logging',
         'uvicorn.loops',
         'uvicorn.loops.auto',
+        'uvicorn.loops.uvloop',
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
+        'uvicorn.protocols.http.httptools_impl',
         'uvicorn.lifespan',
         'uvicorn.lifespan.on',
     ],
@@ -11,7 +11,7 @@ import json
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Optional, Literal, Tuple
 
 
 @dataclass
@@ -301,16 +301,29 @@ class UserManager:
         Returns:
             User object if session is valid, None otherwise
         """
+        found = self.get_session_user(token)
+        return found[0] if found else None
+
+    def get_session_user(self, token: str) -> Optional[Tuple[User, str]]:
+        """Validate a session token and return its user and expiry.
+
+        Args:
+            token: Session token
+
+        Returns:
+            (User, session expires_at ISO timestamp) if the session is
+            valid, None otherwise
+        """
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("""
-                SELECT s.*, u.* FROM sessions s
+                SELECT u.*, s.expires_at AS session_expires_at FROM sessions s
                 JOIN users u ON s.user_id = u.id
                 WHERE s.token = ? AND s.expires_at > ?
             """, (token, datetime.utcnow().isoformat())).fetchone()
 
             if row:
-                return User(
+                user = User(
                     id=row["id"],
                     email=row["email"],
                     name=row["name"],
@@ -319,6 +332,7 @@ class UserManager:
                     email_verified=bool(row["email_verified"]),
                     verification_token=row["verification_token"],
                 )
+                return user, row["session_expires_at"]
         return None
 
     def invalidate_session(self, token: str) -> bool:
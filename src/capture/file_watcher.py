@@ -11,7 +11,10 @@ content from various file types for semantic search and version tracking.
 
 import asyncio
 import hashlib
+import os
 import sqlite3
+import stat
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Literal, Set
@@ -46,6 +49,62 @@ except ImportError:
 
 FileOperation = Literal["created", "modified", "deleted"]
 
+# Table definitions, formatted with the table name so legacy databases can be
+# rebuilt into the same schema (see FileWatcher._migrate_text_timestamps)
+_FILE_HISTORY_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        file_path TEXT NOT NULL,
+        file_name TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        content_hash TEXT,
+        content TEXT,
+        file_type TEXT,
+        file_size INTEGER,
+        metadata JSON,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_FILE_VERSIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        file_path TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        file_size INTEGER,
+        UNIQUE(file_path, version)
+    )
+"""
+
+_TIMESTAMPED_TABLES = (
+    ("file_history", _FILE_HISTORY_TABLE,
+     ("id", "timestamp", "file_path", "file_name", "operation", "content_hash",
+      "content", "file_type", "file_size", "metadata", "created_at")),
+    ("file_versions", _FILE_VERSIONS_TABLE,
+     ("id", "file_path", "version", "content_hash", "timestamp", "file_size")),
+)
+
+# Converts a legacy timestamp value to integer nanoseconds: local-time ISO
+# strings are parsed, and digit strings (integers a TEXT column stored as
+# text) are cast
+_TIMESTAMP_TO_NS = """
+    CASE
+        WHEN typeof(timestamp) != 'text' THEN timestamp
+        WHEN timestamp GLOB '[0-9][0-9][0-9][0-9]-*' THEN
+            CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000000000
+            + CAST(substr(strftime('%f', timestamp), 4) AS INTEGER) * 1000000
+        ELSE CAST(timestamp AS INTEGER)
+    END
+"""
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Format a stored nanosecond epoch timestamp as local ISO-8601."""
+    return datetime.fromtimestamp(timestamp_ns / 1_000_000_000).isoformat()
+
 
 class FileWatcher:
     """
@@ -107,24 +166,16 @@ class FileWatcher:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS file_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                file_path TEXT NOT NULL,
-                file_name TEXT NOT NULL,
-                operation TEXT NOT NULL,
-                content_hash TEXT,
-                content TEXT,
-                file_type TEXT,
-                file_size INTEGER,
-                metadata JSON,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        self._migrate_text_timestamps(conn)
+
+        cursor.execute(_FILE_HISTORY_TABLE.format(table="file_history"))
 
+        # Serves per-file lookups newest-first from the index alone;
+        # supersedes the old single-column idx_file_path.
+        cursor.execute("DROP INDEX IF EXISTS idx_file_path")
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_file_path ON file_history(file_path)
+            CREATE INDEX IF NOT EXISTS idx_hist_path_ts
+            ON file_history(file_path, timestamp DESC)
         """)
 
         cursor.execute("""
@@ -150,51 +201,93 @@ class FileWatcher:
         """)
 
         # Version tracking table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS file_versions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                file_path TEXT NOT NULL,
-                version INTEGER NOT NULL,
-                content_hash TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                file_size INTEGER,
-                UNIQUE(file_path, version)
-            )
-        """)
+        cursor.execute(_FILE_VERSIONS_TABLE.format(table="file_versions"))
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_version_path ON file_versions(file_path)
-        """)
+        # UNIQUE(file_path, version) already provides a covering index for
+        # MAX(version) and ORDER BY version DESC, so a separate one is redundant.
+        cursor.execute("DROP INDEX IF EXISTS idx_version_path")
 
         conn.commit()
         conn.close()
 
+    @staticmethod
+    def _migrate_text_timestamps(conn: sqlite3.Connection):
+        """
+        Rebuild tables whose timestamp column is still declared TEXT.
+
+        Databases created before timestamps became integer nanoseconds hold
+        local-time ISO strings, and a TEXT column would keep storing even
+        integer inserts as text. Each such table is copied into a table with
+        the current schema (ids preserved, so file_content_fts stays valid)
+        and swapped in, all in one transaction. Indexes are recreated by
+        _init_database afterwards.
+
+        Args:
+            conn: Open connection to the file history database
+        """
+        legacy = [
+            (table, template, columns)
+            for table, template, columns in _TIMESTAMPED_TABLES
+            if any(col[1] == "timestamp" and col[2].upper() == "TEXT"
+                   for col in conn.execute(f"PRAGMA table_info({table})"))
+        ]
+        if not legacy:
+            return
+
+        conn.execute("BEGIN")
+        try:
+            for table, template, columns in legacy:
+                column_list = ", ".join(columns)
+                select_list = ", ".join(
+                    _TIMESTAMP_TO_NS if col == "timestamp" else col for col in columns
+                )
+                conn.execute(template.format(table=f"{table}_new"))
+                conn.execute(f"""
+                    INSERT INTO {table}_new ({column_list})
+                    SELECT {select_list} FROM {table}
+                """)
+                conn.execute(f"DROP TABLE {table}")
+                conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
     def _should_ignore(self, path: Path) -> bool:
         """Check if path should be ignored based on ignore patterns."""
         path_parts = path.parts
         return any(pattern in path_parts for pattern in self.ignore_patterns)
 
-    def _should_process(self, path: Path) -> bool:
+    def _should_process(
+        self,
+        path: Path,
+        stat_result: Optional[os.stat_result] = None
+    ) -> bool:
         """
         Determine if file should be processed.
 
         Args:
             path: File path to check
+            stat_result: Result of an earlier stat() on path, reused so the
+                file is only stat'ed once per event
 
         Returns:
             True if file should be processed
         """
-        if not path.is_file():
+        if stat_result is None:
+            try:
+                stat_result = path.stat()
+            except OSError:
+                return False
+
+        if not stat.S_ISREG(stat_result.st_mode):
             return False
 
         if self._should_ignore(path):
             return False
 
         # Check file size
-        try:
-            if path.stat().st_size > self.max_file_size:
-                return False
-        except OSError:
+        if stat_result.st_size > self.max_file_size:
             return False
 
         # Check if it's a supported file type
@@ -347,7 +440,7 @@ class FileWatcher:
         file_path: str,
         content_hash: str,
         file_size: int,
-        timestamp: str
+        timestamp: int
     ):
         """
         Store file version information.
@@ -356,7 +449,7 @@ class FileWatcher:
             file_path: File path
             content_hash: Content hash
             file_size: File size in bytes
-            timestamp: Timestamp of version
+            timestamp: Timestamp of version in nanoseconds since the epoch
         """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -398,10 +491,15 @@ class FileWatcher:
                    suffix in self.CODE_EXTENSIONS or 
                    suffix in self.DOCUMENT_EXTENSIONS):
                 return None
-        elif not self._should_process(path):
-            return None
+        else:
+            try:
+                stat_result = path.stat()
+            except OSError:
+                return None
+            if not self._should_process(path, stat_result):
+                return None
 
-        timestamp = datetime.now().isoformat()
+        timestamp = time.time_ns()
         file_path = str(path.absolute())
         file_name = path.name
         file_type = self._classify_file_type(path)
@@ -424,7 +522,7 @@ class FileWatcher:
             try:
                 content = self._extract_text(path)
                 content_hash = self._compute_file_hash(content)
-                file_size = path.stat().st_size
+                file_size = stat_result.st_size
 
                 event = {
                     'timestamp': timestamp,
@@ -672,7 +770,7 @@ class FileEventHandler(FileSystemEventHandler):
             path = Path(event.src_path)
             result = self.watcher.process_file(path, "created")
             if result:
-                print(f"[{result['timestamp'][:19]}] Created: {result['file_name']} ({result['file_type']})")
+                print(f"[{format_timestamp(result['timestamp'])[:19]}] Created: {result['file_name']} ({result['file_type']})")
 
     def on_modified(self, event: FileSystemEvent):
         """Handle file modification."""
@@ -680,7 +778,7 @@ class FileEventHandler(FileSystemEventHandler):
             path = Path(event.src_path)
             result = self.watcher.process_file(path, "modified")
             if result:
-                print(f"[{result['timestamp'][:19]}] Modified: {result['file_name']} ({result['file_type']})")
+                print(f"[{format_timestamp(result['timestamp'])[:19]}] Modified: {result['file_name']} ({result['file_type']})")
 
     def on_deleted(self, event: FileSystemEvent):
         """Handle file deletion."""
@@ -688,7 +786,7 @@ class FileEventHandler(FileSystemEventHandler):
             path = Path(event.src_path)
             result = self.watcher.process_file(path, "deleted")
             if result:
-                print(f"[{result['timestamp'][:19]}] Deleted: {result['file_name']} ({result['file_type']})")
+                print(f"[{format_timestamp(result['timestamp'])[:19]}] Deleted: {result['file_name']} ({result['file_type']})")
 
 
 # CLI interface
@@ -714,7 +812,7 @@ if __name__ == "__main__":
         results = watcher.search(args.search, file_type=args.type)
         print(f"\nFound {len(results)} results:")
         for r in results:
-            print(f"\n[{r['timestamp']}] {r['file_name']} ({r['file_type']})")
+            print(f"\n[{format_timestamp(r['timestamp'])}] {r['file_name']} ({r['file_type']})")
             print(f"  Path: {r['file_path']}")
             print(f"  Content preview: {r['content'][:200]}...")
 
@@ -724,7 +822,7 @@ if __name__ == "__main__":
         print(f"Total versions: {len(versions)}\n")
         for v in versions:
             print(f"Version {v['version']}:")
-            print(f"  Timestamp: {v['timestamp']}")
+            print(f"  Timestamp: {format_timestamp(v['timestamp'])}")
             print(f"  Hash: {v['content_hash'][:16]}...")
             print(f"  Size: {v['file_size']} bytes")
             print()
@@ -10,24 +10,224 @@ what's on screen rather than requiring integrations with every app.
 """
 
 import asyncio
-import hashlib
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import json
+import platform
+import subprocess
 
 # Note: Install these dependencies:
-# pip install mss pytesseract pillow
+# pip install mss pytesseract pillow numpy
 
 try:
     import mss
+    import numpy as np
     import pytesseract
     from PIL import Image
 except ImportError:
-    print("Install dependencies: pip install mss pytesseract pillow")
+    print("Install dependencies: pip install mss pytesseract pillow numpy")
     raise
 
+# Optional: OpenCV gives a better (and SIMD-accelerated) OCR preprocessing
+# pipeline; without it OCR runs on a plain grayscale conversion.
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Optional: Numba compiles the pHash into a single native kernel.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: tesserocr keeps one Tesseract engine loaded in-process instead of
+# pytesseract's subprocess (and model load) per call.
+try:
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Optional (macOS): pyobjc for the frontmost application and window title.
+MACOS_AVAILABLE = False
+if platform.system() == "Darwin":
+    try:
+        import Quartz
+        from AppKit import (
+            NSWorkspace,
+            NSWorkspaceApplicationKey,
+            NSWorkspaceDidActivateApplicationNotification,
+        )
+        from Foundation import NSDate, NSRunLoop
+        MACOS_AVAILABLE = True
+    except ImportError:
+        print("Warning: pyobjc not installed. Active window tracking disabled.")
+
+
+def _dct_basis(rows: int, size: int) -> "np.ndarray":
+    """First ``rows`` basis vectors of an orthonormal DCT-II of length ``size``."""
+    k = np.arange(rows)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+# pHash works on a 32x32 grayscale thumbnail and keeps the 8x8 lowest
+# frequencies, so only the first 8 DCT rows are ever needed.
+_PHASH_SIZE = 32
+_PHASH_DCT = _dct_basis(8, _PHASH_SIZE)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+    def _luma_thumbnail_kernel(frame, size):
+        """Area-averaged luma thumbnail of a BGRA frame in one pass.
+
+        No full-resolution grayscale or resized copy is ever materialized.
+        """
+        height, width = frame.shape[0], frame.shape[1]
+        sums = np.zeros((size, size), dtype=np.float32)
+        rows_per_cell = np.zeros(size, dtype=np.float32)
+        row_sums = np.zeros((size, 3), dtype=np.float32)
+        for y in range(height):
+            cell_y = y * size // height
+            rows_per_cell[cell_y] += 1
+            # Accumulate each row per channel, one cell at a time
+            for cell_x in range(size):
+                x0 = cell_x * width // size
+                x1 = (cell_x + 1) * width // size
+                b = 0
+                g = 0
+                r = 0
+                for x in range(x0, x1):
+                    b += frame[y, x, 0]
+                    g += frame[y, x, 1]
+                    r += frame[y, x, 2]
+                row_sums[cell_x, 0] = b
+                row_sums[cell_x, 1] = g
+                row_sums[cell_x, 2] = r
+            for cell_x in range(size):
+                sums[cell_y, cell_x] += (
+                    np.float32(0.114) * row_sums[cell_x, 0]
+                    + np.float32(0.587) * row_sums[cell_x, 1]
+                    + np.float32(0.299) * row_sums[cell_x, 2]
+                )
+
+        counts = np.zeros((size, size), dtype=np.float32)
+        for cell_y in range(size):
+            for cell_x in range(size):
+                columns = (cell_x + 1) * width // size - cell_x * width // size
+                counts[cell_y, cell_x] = rows_per_cell[cell_y] * columns
+        return sums / counts
+
+    @njit(cache=True, nogil=True, fastmath=True, boundscheck=False)
+    def _phash_kernel(pixels, basis):
+        """Compiled pHash: low-frequency DCT, median threshold, 64-bit pack.
+
+        Written as explicit loops because Numba's matmul needs SciPy's BLAS.
+        """
+        rows, size = basis.shape
+        partial = np.zeros((rows, size), dtype=np.float32)
+        for i in range(rows):
+            for y in range(size):
+                weight = basis[i, y]
+                for x in range(size):
+                    partial[i, x] += weight * pixels[y, x]
+        
+        low_freq = np.zeros((rows, rows), dtype=np.float32)
+        for i in range(rows):
+            for j in range(rows):
+                total = np.float32(0.0)
+                for x in range(size):
+                    total += partial[i, x] * basis[j, x]
+                low_freq[i, j] = total
+        
+        median = np.median(low_freq)
+        result = np.uint64(0)
+        for i in range(rows):
+            for j in range(rows):
+                result = (result << np.uint64(1)) | np.uint64(low_freq[i, j] > median)
+        return result
+
+# Fraction of dark (foreground) pixels after binarization outside which a
+# frame is treated as blank or pictorial and OCR is skipped.
+_OCR_MIN_DENSITY = 0.02
+_OCR_MAX_DENSITY = 0.5
+
+# Frame-diff grid used to find the changed region of the screen. Tiles whose
+# mean intensity moves by more than the threshold count as changed; when
+# the changed area is at most the given fraction of the screen, only that
+# region is sent to OCR.
+_DIFF_GRID = (64, 36)
+_DIFF_THRESHOLD = 16
+_ROI_MAX_FRACTION = 0.25
+
+# Idle backoff: each tick without a new capture doubles the interval, up to
+# this many seconds (never below the configured interval).
+_IDLE_INTERVAL_MAX = 60
+
+# Polled active-window lookups (which fork a helper on Linux) are reused for
+# this many seconds.
+_WINDOW_LOOKUP_TTL = 0.5
+
+# Frames wider or taller than this are OCR'd at half resolution.
+_OCR_MAX_SIDE = 2560
+
+# Number of recent pHash -> OCR text results remembered, so switching back
+# to a recently seen screen does not run tesseract again.
+_OCR_CACHE_SIZE = 512
+
+# Captures are written by a background thread in batches: at most this many
+# rows, or rows this many seconds old, are held before a single-transaction
+# write. The hand-off queue is bounded so a stalled disk applies backpressure.
+_WRITE_BATCH_SIZE = 16
+_WRITE_BATCH_MAX_AGE = 1.0
+_WRITE_QUEUE_SIZE = 256
+
+# Writer queue control markers
+_FLUSH = object()
+_STOP = object()
+
+_INSERT_CAPTURE_SQL = """
+    INSERT INTO captures
+    (timestamp, screen_hash, extracted_text, active_window, active_app,
+     screen_width, screen_height, text_length, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Ranked with bm25(); snippet() builds a highlighted excerpt during the scan.
+_SEARCH_CAPTURES_SQL = """
+    SELECT c.id, c.timestamp, c.extracted_text,
+           snippet(captures_fts, 0, '<b>', '</b>', '…', 16),
+           c.active_window, c.active_app
+    FROM captures_fts
+    JOIN captures c ON c.id = captures_fts.rowid
+    WHERE captures_fts MATCH ?
+    ORDER BY bm25(captures_fts)
+    LIMIT ?
+"""
+
+
+_HAS_BITWISE_COUNT = hasattr(np, 'bitwise_count')  # NumPy >= 2.0
+
+
+def _popcount64(values: "np.ndarray") -> "np.ndarray":
+    """Per-element popcount of a uint64 array."""
+    if _HAS_BITWISE_COUNT:  # hardware POPCNT
+        return np.bitwise_count(values).astype(np.int64)
+    bits = np.unpackbits(values.view(np.uint8)).reshape(-1, 64)
+    return bits.sum(axis=1, dtype=np.int64)
+
 
 class ScreenCapture:
     """
@@ -40,35 +240,100 @@ class ScreenCapture:
         db_path: Path = Path("~/.unified-ai/capture.db").expanduser(),
         capture_interval: int = 5,  # seconds
         min_change_threshold: float = 0.1,  # 10% pixel change to store
+        min_change_bits: int = 3,  # pHash bits that must differ to store
     ):
         self.db_path = db_path
         self.capture_interval = capture_interval
         self.min_change_threshold = min_change_threshold
-        self.last_hash: Optional[str] = None
+        self.min_change_bits = min_change_bits
+        self.last_hash: Optional[int] = None
         self.running = False
+        # mss handles are bound to the thread that opened them (X11 display
+        # connections in particular), so keep one per thread and reuse it
+        self._sct_local = threading.local()
+        self._sct_handles: list = []
+        self._window_pool: Optional[ThreadPoolExecutor] = None
+        self._clahe = None  # cv2 CLAHE operator, created on first OCR
+        self._tess = None  # tesserocr engine, created on first OCR
+        self._conn: Optional[sqlite3.Connection] = None
+        # pHash -> OCR text LRU, laid out as parallel arrays so a lookup is
+        # one vectorized XOR + popcount over every cached hash.
+        self._ocr_keys = np.zeros(_OCR_CACHE_SIZE, dtype=np.uint64)
+        self._ocr_last_used = np.full(_OCR_CACHE_SIZE, -1, dtype=np.int64)  # -1: empty slot
+        self._ocr_texts: list[Optional[str]] = [None] * _OCR_CACHE_SIZE
+        self._ocr_clock = 0
+        self._prev_tiles: Optional[np.ndarray] = None  # diff grid of last stored frame
+        self._active_app = "Unknown App"
+        self._active_pid: Optional[int] = None
+        self._active_window: Optional[str] = None  # None: look up on next capture
+        self._activation_observer = None
+        self._window_cache: Optional[tuple[float, tuple[str, str]]] = None  # (time, result)
+        if MACOS_AVAILABLE:
+            self._watch_app_activation()
+        # Consecutive idle ticks (no capture stored); sets the backoff exponent
+        # and stops growing once the delay reaches the ceiling
+        self._idle_streak = 0
+        self._write_queue: queue.Queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None  # started on first store
+        self._writer_lock = threading.Lock()
         
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the capture database connection, opening it on first use.
+        
+        The connection is kept open for the life of the capture so each
+        insert is a WAL append instead of a full open/fsync/close cycle.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+        return self._conn
+    
     def _init_database(self):
         """Initialize SQLite database for captured content."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS captures (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 timestamp TEXT NOT NULL,
-                screen_hash TEXT NOT NULL,
+                screen_hash BLOB NOT NULL,
                 extracted_text TEXT,
                 active_window TEXT,
                 active_app TEXT,
+                screen_width INTEGER,
+                screen_height INTEGER,
+                text_length INTEGER,
                 metadata JSON,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
+        # Older databases kept screen size and text length in the metadata
+        # JSON; move them into typed columns.
+        cursor.execute("PRAGMA table_info(captures)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'screen_width' not in columns:
+            for column in ('screen_width', 'screen_height', 'text_length'):
+                cursor.execute(f"ALTER TABLE captures ADD COLUMN {column} INTEGER")
+            cursor.execute("""
+                UPDATE captures SET
+                    screen_width = json_extract(metadata, '$.screen_size[0]'),
+                    screen_height = json_extract(metadata, '$.screen_size[1]'),
+                    text_length = json_extract(metadata, '$.text_length'),
+                    metadata = NULLIF(
+                        json_remove(metadata, '$.screen_size', '$.text_length'), '{}'
+                    )
+                WHERE json_valid(metadata)
+            """)
+        
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_timestamp ON captures(timestamp)
         """)
@@ -81,120 +346,484 @@ class ScreenCapture:
             )
         """)
         
+        # Keep the external-content FTS index in step with captures so the
+        # write path is a single INSERT.
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS captures_ai AFTER INSERT ON captures BEGIN
+                INSERT INTO captures_fts(rowid, extracted_text)
+                VALUES (new.id, new.extracted_text);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS captures_ad AFTER DELETE ON captures BEGIN
+                INSERT INTO captures_fts(captures_fts, rowid, extracted_text)
+                VALUES ('delete', old.id, old.extracted_text);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS captures_au AFTER UPDATE ON captures BEGIN
+                INSERT INTO captures_fts(captures_fts, rowid, extracted_text)
+                VALUES ('delete', old.id, old.extracted_text);
+                INSERT INTO captures_fts(rowid, extracted_text)
+                VALUES (new.id, new.extracted_text);
+            END
+        """)
+        
         conn.commit()
-        conn.close()
-    
-    def _compute_image_hash(self, image: Image.Image) -> str:
-        """Compute perceptual hash for change detection."""
-        # Resize to small size for fast comparison
-        small = image.resize((16, 16)).convert('L')
-        pixels = list(small.getdata())
-        avg = sum(pixels) / len(pixels)
-        bits = ''.join('1' if p > avg else '0' for p in pixels)
-        return hashlib.md5(bits.encode()).hexdigest()
-    
-    def _has_significant_change(self, current_hash: str) -> bool:
+    
+    def _compute_image_hash(self, image) -> int:
+        """Compute a 64-bit DCT perceptual hash (pHash) for change detection.
+        
+        Args:
+            image: PIL image, or a raw BGRA frame as a (height, width, 4)
+                uint8 array (requires Numba or OpenCV).
+        """
+        # Area-average down to 32x32 before going gray so no full-size
+        # intermediate image is allocated.
+        if isinstance(image, np.ndarray) and NUMBA_AVAILABLE:
+            # Fused decimate + luma + DCT; releases the GIL throughout
+            thumb = _luma_thumbnail_kernel(image, _PHASH_SIZE)
+            return int(_phash_kernel(thumb, _PHASH_DCT))
+        if isinstance(image, np.ndarray):
+            thumb = cv2.resize(image, (_PHASH_SIZE, _PHASH_SIZE), interpolation=cv2.INTER_AREA)
+            small = cv2.cvtColor(thumb, cv2.COLOR_BGRA2GRAY)
+        else:
+            small = image.resize((_PHASH_SIZE, _PHASH_SIZE), Image.BOX).convert('L')
+        pixels = np.asarray(small, dtype=np.float32)
+        if NUMBA_AVAILABLE:
+            return int(_phash_kernel(pixels, _PHASH_DCT))
+        low_freq = _PHASH_DCT @ pixels @ _PHASH_DCT.T
+        bits = (low_freq > np.median(low_freq)).ravel()
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+    
+    def _has_significant_change(self, current_hash: int) -> bool:
         """Check if screen content has changed significantly."""
         if self.last_hash is None:
             return True
-        return current_hash != self.last_hash
+        # Hashes within a couple of bits are the same screen (cursor blink,
+        # clock tick); anything further apart is new content.
+        return (current_hash ^ self.last_hash).bit_count() >= self.min_change_bits
+    
+    def _preprocess_for_ocr(self, image: Image.Image):
+        """Convert a screenshot into the image handed to tesseract.
+
+        With OpenCV available this equalizes local contrast (CLAHE) and
+        binarizes with an adaptive threshold, which copes with mixed light
+        and dark UI regions. Otherwise it falls back to plain grayscale.
+        
+        HiDPI frames are halved first: screen text is already well above
+        the glyph height tesseract's LSTM works at, and OCR time scales
+        with pixel count.
+        """
+        width, height = image.size
+        downscale = max(width, height) > _OCR_MAX_SIDE
+        if not CV2_AVAILABLE:
+            gray = image.convert('L')
+            if downscale:
+                gray = gray.resize((width // 2, height // 2), Image.BILINEAR)
+            return gray
+        
+        gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        if downscale:
+            gray = cv2.resize(gray, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+        if self._clahe is None:
+            self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        equalized = self._clahe.apply(gray)
+        return cv2.adaptiveThreshold(
+            equalized, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        )
+    
+    def _looks_like_text(self, prepared) -> bool:
+        """Cheap check that a preprocessed frame could contain text.
+        
+        Only the binarized OpenCV output can be judged; the grayscale
+        fallback always goes to OCR.
+        """
+        if not isinstance(prepared, np.ndarray):
+            return True
+        density = 1.0 - cv2.countNonZero(prepared) / prepared.size
+        return _OCR_MIN_DENSITY <= density <= _OCR_MAX_DENSITY
+    
+    def _ocr_in_process(self, prepared) -> str:
+        """OCR with a persistent tesserocr engine.
+        
+        The engine is not thread-safe; captures only ever OCR on run()'s
+        single worker thread.
+        """
+        if self._tess is None:
+            self._tess = PyTessBaseAPI(psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+        if isinstance(prepared, np.ndarray):
+            prepared = Image.fromarray(prepared)
+        self._tess.SetImage(prepared)
+        return self._tess.GetUTF8Text()
     
     def _extract_text(self, image: Image.Image) -> str:
         """Extract text from screenshot using OCR."""
         try:
             # Preprocess for better OCR
-            gray = image.convert('L')
-            text = pytesseract.image_to_string(gray)
+            prepared = self._preprocess_for_ocr(image)
+            # Blank screens, lock screens and video frames rarely hold
+            # readable text, and tesseract dominates the capture cost.
+            if not self._looks_like_text(prepared):
+                return ""
+            if TESSEROCR_AVAILABLE:
+                text = self._ocr_in_process(prepared)
+            else:
+                # LSTM engine only, matching the in-process tesserocr setup
+                text = pytesseract.image_to_string(prepared, config='--oem 1')
             return text.strip()
         except Exception as e:
             print(f"OCR failed: {e}")
             return ""
     
+    def _changed_region(self, image: Image.Image) -> Optional[tuple[int, int, int, int]]:
+        """Find the screen region that changed since the last stored frame.
+        
+        Returns:
+            (left, top, right, bottom) pixel box of the changed tiles, or
+            None when the whole frame should be OCR'd (first frame, a large
+            change, or no change localized by the grid).
+        """
+        grid_w, grid_h = _DIFF_GRID
+        tiles = np.asarray(image.resize(_DIFF_GRID, Image.BOX).convert('L'), dtype=np.int16)
+        prev_tiles, self._prev_tiles = self._prev_tiles, tiles
+        if prev_tiles is None:
+            return None
+        
+        changed = np.abs(tiles - prev_tiles) > _DIFF_THRESHOLD
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        if rows.size == 0:
+            return None
+        
+        # Pad by one tile so glyphs straddling a tile edge are not clipped
+        top, bottom = max(int(rows[0]) - 1, 0), min(int(rows[-1]) + 2, grid_h)
+        left, right = max(int(cols[0]) - 1, 0), min(int(cols[-1]) + 2, grid_w)
+        if (bottom - top) * (right - left) > _ROI_MAX_FRACTION * grid_w * grid_h:
+            return None
+        
+        width, height = image.size
+        return (
+            left * width // grid_w,
+            top * height // grid_h,
+            right * width // grid_w,
+            bottom * height // grid_h,
+        )
+    
+    def _cached_text(self, image_hash: int) -> Optional[str]:
+        """Return OCR text of a recently seen near-identical frame, if any."""
+        distances = _popcount64(self._ocr_keys ^ np.uint64(image_hash))
+        distances[self._ocr_last_used < 0] = 64
+        slot = int(np.argmin(distances))
+        if distances[slot] > 2:
+            return None
+        self._ocr_clock += 1
+        self._ocr_last_used[slot] = self._ocr_clock
+        return self._ocr_texts[slot]
+    
+    def _remember_text(self, image_hash: int, text: str):
+        """Cache OCR text for a frame hash, evicting the least recently used."""
+        slot = int(np.argmin(self._ocr_last_used))  # empty slots sort first
+        self._ocr_clock += 1
+        self._ocr_keys[slot] = image_hash
+        self._ocr_texts[slot] = text
+        self._ocr_last_used[slot] = self._ocr_clock
+    
+    def _watch_app_activation(self):
+        """Track the frontmost macOS app via workspace activation notifications.
+        
+        The window list is only queried again after the user switches apps,
+        instead of on every capture.
+        """
+        workspace = NSWorkspace.sharedWorkspace()
+        self._set_active_app(workspace.frontmostApplication())
+        self._activation_observer = workspace.notificationCenter().addObserverForName_object_queue_usingBlock_(
+            NSWorkspaceDidActivateApplicationNotification,
+            None,
+            None,
+            lambda note: self._set_active_app(note.userInfo()[NSWorkspaceApplicationKey]),
+        )
+    
+    def _set_active_app(self, app):
+        """Record a newly activated application; its window title is refetched lazily."""
+        if app is None:
+            return
+        self._active_app = app.localizedName() or "Unknown App"
+        self._active_pid = app.processIdentifier()
+        self._active_window = None
+    
+    def _pump_notifications(self):
+        """Deliver pending workspace notifications (macOS only).
+        
+        Notifications are posted to the main thread's run loop, which the
+        asyncio loop otherwise never spins; run() calls this each tick.
+        """
+        if MACOS_AVAILABLE:
+            NSRunLoop.currentRunLoop().runUntilDate_(NSDate.date())
+    
+    def _lookup_window_title(self, pid: int) -> str:
+        """Title of the frontmost on-screen window owned by ``pid``."""
+        windows = Quartz.CGWindowListCopyWindowInfo(
+            Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+            Quartz.kCGNullWindowID,
+        )
+        for window in windows or []:
+            if window.get(Quartz.kCGWindowOwnerPID) == pid and window.get(Quartz.kCGWindowLayer) == 0:
+                return window.get(Quartz.kCGWindowName) or "Unknown Window"
+        return "Unknown Window"
+    
+    def _poll_active_window(self) -> tuple[str, str]:
+        """Query the focused window on platforms without change notifications."""
+        system = platform.system()
+        
+        if system == "Linux":
+            # One chained xdotool call prints the title, then the owning PID
+            result = subprocess.run(
+                ['xdotool', 'getactivewindow', 'getwindowname', 'getwindowpid'],
+                capture_output=True,
+                text=True,
+                timeout=1
+            )
+            lines = result.stdout.splitlines()
+            if lines:
+                # Windows without _NET_WM_PID still print their title
+                title = lines[0].strip() or "Unknown Window"
+                app_name = "Unknown App"
+                if len(lines) > 1 and lines[1].strip().isdigit():
+                    try:
+                        comm = Path(f"/proc/{lines[1].strip()}/comm").read_text()
+                        app_name = comm.strip() or app_name
+                    except OSError:
+                        pass
+                return (title, app_name)
+        
+        elif system == "Windows":
+            try:
+                import win32gui
+                window = win32gui.GetForegroundWindow()
+                return (win32gui.GetWindowText(window) or "Unknown Window", "Unknown App")
+            except ImportError:
+                pass
+        
+        return ("Unknown Window", "Unknown App")
+    
     def _get_active_window(self) -> tuple[str, str]:
         """Get active window title and application name."""
-        # Platform-specific implementation needed
-        # This is a placeholder - implement for your OS
         try:
-            # macOS example using pyobjc
-            # Linux example using xdotool
-            # Windows example using pywin32
-            return ("Unknown Window", "Unknown App")
+            if MACOS_AVAILABLE and self._active_pid is not None:
+                if self._active_window is None:
+                    self._active_window = self._lookup_window_title(self._active_pid)
+                return (self._active_window, self._active_app)
+            
+            now = time.monotonic()
+            if self._window_cache is not None and now - self._window_cache[0] < _WINDOW_LOOKUP_TTL:
+                return self._window_cache[1]
+            result = self._poll_active_window()
+            self._window_cache = (now, result)
+            return result
         except Exception:
             return ("Unknown Window", "Unknown App")
     
+    def _get_sct(self):
+        """Return this thread's mss handle, opening it on first use.
+
+        Opening mss reconnects to the display server (X11 display, GDI
+        device context), so the handle is kept for the life of the capture.
+        """
+        sct = getattr(self._sct_local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._sct_local.sct = sct
+            self._sct_handles.append(sct)
+        return sct
+    
+    def _get_window_pool(self) -> ThreadPoolExecutor:
+        """Return the executor used for active-window lookups."""
+        if self._window_pool is None:
+            self._window_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="active-window")
+        return self._window_pool
+    
+    def _decode_frame(self, screenshot) -> Image.Image:
+        """Convert an mss screenshot into an RGB PIL image."""
+        # Decode straight from mss's raw buffer; screenshot.bgra would
+        # first copy the whole frame into a new bytes object.
+        return Image.frombuffer(
+            'RGB',
+            screenshot.size,
+            screenshot.raw,
+            'raw',
+            'BGRX',
+            0,
+            1
+        )
+    
     def capture_once(self) -> Optional[dict]:
         """Capture a single screenshot and process it."""
-        with mss.mss() as sct:
-            # Capture primary monitor
-            monitor = sct.monitors[1]  # Primary monitor
-            screenshot = sct.grab(monitor)
-            
-            # Convert to PIL Image
-            image = Image.frombytes(
-                'RGB',
-                screenshot.size,
-                screenshot.bgra,
-                'raw',
-                'BGRX'
-            )
-            
-            # Check for significant change
+        sct = self._get_sct()
+        # Capture primary monitor
+        monitor = sct.monitors[1]  # Primary monitor
+        screenshot = sct.grab(monitor)
+        
+        if NUMBA_AVAILABLE or CV2_AVAILABLE:
+            # Hash straight off mss's BGRA buffer (a zero-copy view) so that
+            # unchanged frames are never decoded at all.
+            width, height = screenshot.size
+            frame = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(height, width, 4)
+            current_hash = self._compute_image_hash(frame)
+            image = None
+        else:
+            image = self._decode_frame(screenshot)
             current_hash = self._compute_image_hash(image)
-            if not self._has_significant_change(current_hash):
-                return None
-            
-            self.last_hash = current_hash
-            
-            # Extract text
-            extracted_text = self._extract_text(image)
-            
-            # Get active window info
-            window_title, app_name = self._get_active_window()
-            
-            # Create capture record
-            capture = {
-                'timestamp': datetime.now().isoformat(),
-                'screen_hash': current_hash,
-                'extracted_text': extracted_text,
-                'active_window': window_title,
-                'active_app': app_name,
-                'metadata': {
-                    'screen_size': screenshot.size,
-                    'text_length': len(extracted_text),
-                }
+        
+        # Check for significant change
+        if not self._has_significant_change(current_hash):
+            return None
+        
+        if image is None:
+            image = self._decode_frame(screenshot)
+        
+        self.last_hash = current_hash
+        
+        # The window lookup may shell out; overlap it with OCR
+        window_future = self._get_window_pool().submit(self._get_active_window)
+        region = self._changed_region(image)
+        
+        # Extract text, reusing OCR from a recent near-identical frame.
+        # Small changes only OCR the changed region; those partial results
+        # are not cached since they don't describe the whole frame.
+        extracted_text = self._cached_text(current_hash)
+        if extracted_text is None:
+            if region is None:
+                extracted_text = self._extract_text(image)
+                self._remember_text(current_hash, extracted_text)
+            else:
+                extracted_text = self._extract_text(image.crop(region))
+        else:
+            region = None
+        
+        # Get active window info
+        window_title, app_name = window_future.result()
+        
+        # Create capture record
+        capture = {
+            'timestamp': datetime.now().isoformat(),
+            'screen_hash': current_hash.to_bytes(8, 'big'),
+            'extracted_text': extracted_text,
+            'active_window': window_title,
+            'active_app': app_name,
+            'metadata': {
+                'screen_size': screenshot.size,
+                'text_length': len(extracted_text),
             }
-            
-            # Store in database
-            self._store_capture(capture)
-            
-            return capture
+        }
+        if region is not None:
+            capture['metadata']['ocr_region'] = region
+        
+        # Store in database
+        self._store_capture(capture)
+        
+        return capture
     
     def _store_capture(self, capture: dict):
-        """Store capture in SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Queue capture for storage in SQLite database.
         
-        cursor.execute("""
-            INSERT INTO captures 
-            (timestamp, screen_hash, extracted_text, active_window, active_app, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        A background thread writes rows in one transaction once the batch
+        is full or its oldest row is stale; call flush() to force a write.
+        """
+        metadata = capture['metadata']
+        width, height = metadata['screen_size']
+        # Fixed fields have typed columns; only irregular extras go to JSON
+        extra = {
+            key: value for key, value in metadata.items()
+            if key not in ('screen_size', 'text_length')
+        }
+        row = (
             capture['timestamp'],
             capture['screen_hash'],
             capture['extracted_text'],
             capture['active_window'],
             capture['active_app'],
-            json.dumps(capture['metadata'])
-        ))
-        
-        # Update FTS index
-        cursor.execute("""
-            INSERT INTO captures_fts(rowid, extracted_text)
-            VALUES (last_insert_rowid(), ?)
-        """, (capture['extracted_text'],))
+            width,
+            height,
+            metadata['text_length'],
+            json.dumps(extra) if extra else None
+        )
+        self._ensure_writer()
+        self._write_queue.put(row)
+    
+    def _ensure_writer(self):
+        """Start the background writer thread if it is not running."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="capture-writer", daemon=True
+                )
+                self._writer.start()
+    
+    def _writer_loop(self):
+        """Drain queued capture rows into SQLite in batched transactions."""
+        # The writer owns its connection; WAL lets search() read concurrently
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        batch: list[tuple] = []
+        deadline = 0.0
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if batch else None
+                try:
+                    item = self._write_queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None  # oldest row reached _WRITE_BATCH_MAX_AGE
+                
+                if item is not None and item is not _FLUSH and item is not _STOP:
+                    if not batch:
+                        deadline = time.monotonic() + _WRITE_BATCH_MAX_AGE
+                    batch.append(item)
+                    if len(batch) < _WRITE_BATCH_SIZE:
+                        continue
+                
+                if batch:
+                    try:
+                        # captures_fts is updated by the captures_ai trigger
+                        with conn:
+                            conn.executemany(_INSERT_CAPTURE_SQL, batch)
+                    except sqlite3.Error as e:
+                        print(f"Failed to store {len(batch)} captures: {e}")
+                    for _ in batch:
+                        self._write_queue.task_done()
+                    batch.clear()
+                
+                if item is _FLUSH or item is _STOP:
+                    self._write_queue.task_done()
+                if item is _STOP:
+                    return
+        finally:
+            conn.close()
+    
+    def flush(self):
+        """Block until every queued capture has been written."""
+        if self._writer is not None:
+            self._write_queue.put(_FLUSH)
+            self._write_queue.join()
+    
+    def _next_interval(self, captured: bool) -> float:
+        """Record a tick's outcome and return the delay before the next one.
         
-        conn.commit()
-        conn.close()
+        Any change snaps back to the base interval; consecutive idle ticks
+        back off exponentially to _IDLE_INTERVAL_MAX seconds. Idle ticks are
+        cheap (grab and pHash only), so backing off mostly saves wakeups.
+        """
+        if captured:
+            self._idle_streak = 0
+            return self.capture_interval
+        self._idle_streak += 1
+        ceiling = max(self.capture_interval, _IDLE_INTERVAL_MAX)
+        # Stop growing the exponent once past the ceiling
+        if self.capture_interval * 2 ** (self._idle_streak - 1) >= ceiling:
+            self._idle_streak -= 1
+        return min(ceiling, self.capture_interval * 2 ** self._idle_streak)
     
     async def run(self):
         """Run continuous capture loop."""
@@ -203,46 +832,72 @@ class ScreenCapture:
         print(f"Database: {self.db_path}")
         print("Press Ctrl+C to stop")
         
-        while self.running:
-            try:
-                capture = self.capture_once()
-                if capture:
-                    text_preview = capture['extracted_text'][:100].replace('\n', ' ')
-                    print(f"[{capture['timestamp'][:19]}] Captured: {text_preview}...")
-            except Exception as e:
-                print(f"Capture error: {e}")
-            
-            await asyncio.sleep(self.capture_interval)
+        # Grabbing, OCR and writes block for hundreds of milliseconds, so run
+        # them on one dedicated worker thread (mss handles and the OCR cache
+        # live on self) to keep the event loop free for other sources.
+        loop = asyncio.get_running_loop()
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screen-capture")
+        try:
+            while self.running:
+                capture = None
+                try:
+                    self._pump_notifications()
+                    capture = await loop.run_in_executor(worker, self.capture_once)
+                    if capture:
+                        text_preview = capture['extracted_text'][:100].replace('\n', ' ')
+                        print(f"[{capture['timestamp'][:19]}] Captured: {text_preview}...")
+                except Exception as e:
+                    print(f"Capture error: {e}")
+                
+                await asyncio.sleep(self._next_interval(capture is not None))
+        finally:
+            worker.shutdown(wait=True)
+            self.close()
     
     def stop(self):
         """Stop the capture loop."""
         self.running = False
     
+    def close(self):
+        """Write pending captures and release the grabber and connections."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._write_queue.put(_STOP)
+            writer.join()
+        if self._window_pool is not None:
+            self._window_pool.shutdown(wait=True)
+            self._window_pool = None
+        for sct in self._sct_handles:
+            sct.close()
+        self._sct_handles.clear()
+        self._sct_local = threading.local()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._tess is not None:
+            self._tess.End()
+            self._tess = None
+        if self._activation_observer is not None:
+            NSWorkspace.sharedWorkspace().notificationCenter().removeObserver_(self._activation_observer)
+            self._activation_observer = None
+    
     def search(self, query: str, limit: int = 10) -> list[dict]:
-        """Search captured content using full-text search."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT c.id, c.timestamp, c.extracted_text, c.active_window, c.active_app
-            FROM captures c
-            JOIN captures_fts fts ON c.id = fts.rowid
-            WHERE captures_fts MATCH ?
-            ORDER BY c.timestamp DESC
-            LIMIT ?
-        """, (query, limit))
+        """Search captured content using full-text search, best match first."""
+        self.flush()
+        rows = self._get_conn().execute(_SEARCH_CAPTURES_SQL, (query, limit)).fetchall()
         
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             results.append({
                 'id': row[0],
                 'timestamp': row[1],
                 'text': row[2],
-                'window': row[3],
-                'app': row[4]
+                'snippet': row[3],
+                'window': row[4],
+                'app': row[5]
             })
         
-        conn.close()
         return results
 
 
@@ -316,7 +971,7 @@ if __name__ == "__main__":
         results = capture.search(args.search)
         for r in results:
             print(f"\n[{r['timestamp']}] {r['app']}")
-            print(f"  {r['text'][:200]}...")
+            print(f"  {r['snippet']}")
     else:
         try:
             asyncio.run(capture.run())
@@ -17,59 +17,251 @@ Usage:
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+import asyncio
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import hashlib
+import heapq
+import inspect
+import itertools
 import json
+import operator
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Optional: orjson parses stored metadata and settings several times faster
+# than the stdlib json module.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
-from src.store.semantic_store import SemanticStore
+# Only needed when run as a plain script (python src/interface/dashboard/server.py);
+# imported as part of the package, the project root is already importable.
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.store.semantic_store import SemanticStore, fts_query
 from src.thought.rag import RAGEngine
 
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Close the store's connections (refreshing planner stats) on shutdown."""
+    yield
+    store.close()
+
+
 app = FastAPI(
     title="Unified AI System Dashboard",
     description="Local web dashboard for visualizing captured data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=_lifespan
 )
 
-# Enable CORS for local development
+# Enable CORS for local development. The built frontend is served from
+# this app (same origin); cross-origin callers are the Vite dev server and
+# the browser extension. No endpoint reads cookies, so no credentials.
+_CORS_ORIGINS = [
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=_CORS_ORIGINS,
+    allow_origin_regex=r"(chrome|moz)-extension://.*",
+    allow_methods=["GET", "POST", "PUT"],
+    allow_headers=["Content-Type"],
 )
 
+# Timeline, search and graph payloads are repetitive JSON; compress the
+# larger ones for clients that accept gzip (level 5 trades ratio for CPU)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize systems
 store = SemanticStore()
 rag_engine = RAGEngine(store=store)
 
+class _ImmutableStaticFiles(StaticFiles):
+    """Static files browsers may cache forever (Vite hashes the file names)."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 # Mount React static files
 DIST_DIR = Path(__file__).parent.parent / "web" / "dist"
 if DIST_DIR.exists():
-    app.mount("/assets", StaticFiles(directory=str(DIST_DIR / "assets")), name="assets")
+    app.mount("/assets", _ImmutableStaticFiles(directory=str(DIST_DIR / "assets")), name="assets")
+
+
+# Read-heavy aggregate endpoints are polled by the dashboard; their results
+# are reused for this many seconds per distinct set of query parameters.
+# Writes invalidate entries immediately (see _ttl_cache), so the TTL only
+# matters for results over a window that rolls with the clock; entity
+# aggregates have no such window and are kept longer.
+_RESPONSE_CACHE_TTL = 5.0
+_STATS_CACHE_TTL = 10.0
+_ENTITY_CACHE_TTL = 30.0
+_RESPONSE_CACHE_SIZE = 256
+_response_cache: Dict[tuple, tuple[float, Any]] = {}
+_response_cache_lock = threading.Lock()
+
+# PRAGMA data_version on a connection that never writes moves on every
+# commit made through any other connection: the store's per-thread
+# connections as well as the capture daemons.
+_version_conn = sqlite3.connect(store.db_path, check_same_thread=False)
+_version_lock = threading.Lock()
+
+
+def _data_version() -> int:
+    """Token that changes whenever the database does. O(1)."""
+    with _version_lock:
+        return _version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _ttl_cache(seconds: float = _RESPONSE_CACHE_TTL):
+    """Cache a GET endpoint's result per query arguments.
+
+    Entries are keyed by the data version as well, so any write makes them
+    unreachable at once; the TTL only bounds how long results over rolling
+    time windows (last N days, last 24 hours) can lag the clock.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            key = (func.__name__, _data_version(), tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = _response_cache.get(key)
+            if cached is not None and now - cached[0] < seconds:
+                return cached[1]
+            result = func(**kwargs)
+            with _response_cache_lock:
+                _response_cache.pop(key, None)
+                if len(_response_cache) >= _RESPONSE_CACHE_SIZE:
+                    # Drop the oldest entry
+                    del _response_cache[next(iter(_response_cache))]
+                _response_cache[key] = (now, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def _conditional_get(rolling: bool = False):
+    """Answer a GET endpoint's If-None-Match with 304 while data is unchanged.
+
+    The ETag hashes the request URL with the data version; endpoints over
+    rolling time windows also fold in the current minute.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request: Request, response: Response, **kwargs):
+            parts = [str(request.url), str(_data_version())]
+            if rolling:
+                parts.append(str(int(time.time() // 60)))
+            digest = hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+            etag = f'"{digest}"'
+            if_none_match = request.headers.get("if-none-match", "")
+            if etag in (tag.strip() for tag in if_none_match.split(",")):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+            return func(**kwargs)
+
+        # Let FastAPI inject the request and response alongside the
+        # endpoint's own query parameters
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            *(p.replace(kind=inspect.Parameter.KEYWORD_ONLY) for p in signature.parameters.values()),
+        ])
+        return wrapper
+    return decorator
+
+
+def _capture_metadata(active_window, active_app, width, height, text_length, extra) -> Dict[str, Any]:
+    """Build the API metadata dict for a row of the captures table."""
+    metadata = {'active_window': active_window, 'active_app': active_app}
+    if width is not None:
+        metadata['screen_size'] = [width, height]
+    if text_length is not None:
+        metadata['text_length'] = text_length
+    if extra:
+        metadata.update(_json_loads(extra))
+    return metadata
+
+
+def _preview(text: str, length: int, size: int) -> str:
+    """Cut text (whose full length is ``length``) to ``size`` chars plus "..."."""
+    return text[:size] + "..." if length > size else text
+
+
+def _timeline_item(row: tuple) -> Dict[str, Any]:
+    """Build a timeline item from a semantic_content preview row."""
+    content, length = row[1], row[2]
+    return {
+        'id': row[0],
+        'content': _preview(content, length, 500),
+        'content_preview': _preview(content, length, 200),
+        'source_type': row[3],
+        'source_id': row[4],
+        'timestamp': row[5],
+        'metadata': _json_loads(row[6]) if row[6] else {}
+    }
+
+
+def _capture_timeline_item(row: tuple) -> Dict[str, Any]:
+    """Build a timeline item from a captures preview row."""
+    content, length = row[1], row[2]
+    return {
+        'id': f"screen_{row[0]}",
+        'content': _preview(content, length, 500),
+        'content_preview': _preview(content, length, 200),
+        'source_type': 'screen',
+        'source_id': row[0],
+        'timestamp': row[3],
+        'metadata': _capture_metadata(*row[4:10])
+    }
 
 
 @app.get("/api/search")
 async def search(
     q: str = Query(..., description="Search query"),
-    mode: str = Query("hybrid", description="Search mode: hybrid, semantic, exact"),
+    mode: str = Query("hybrid", description="Search mode: hybrid, semantic, exact (or text)"),
+    source_type: Optional[str] = Query(None, description="Filter text search by source type"),
     limit: int = Query(20, ge=1, le=100)
-):
+) -> Dict[str, Any]:
     """
     Search across captured content.
-    Mode 'semantic' or 'hybrid' uses the RAG engine for intelligence.
+    Mode 'exact' (alias 'text') runs full-text search over stored content
+    and screen captures; 'semantic' or 'hybrid' uses the RAG engine for
+    intelligence.
     """
-    if mode == "exact":
-        # Simple DB search
-        results = store.search(q, limit=limit)
+    if mode in ("exact", "text"):
+        # Simple DB search, off the event loop
+        results = await run_in_threadpool(_text_search, q, source_type, limit)
         return {"results": results, "answer": None}
     
     # RAG Search (Ask my Data)
@@ -90,153 +282,179 @@ async def search(
         "results": rag_result["context"]
     }
 
-if DIST_DIR.exists():
-    app.mount("/assets", StaticFiles(directory=str(DIST_DIR / "assets")), name="assets")
-
 
+# Endpoints that only query SQLite are plain ``def``: FastAPI runs them in
+# its threadpool, so a slow aggregation never stalls the event loop (or a
+# concurrent RAG search).
 @app.get("/api/timeline")
-async def get_timeline(
+@_ttl_cache()
+def get_timeline(
     days: int = Query(7, ge=1, le=90, description="Number of days to retrieve"),
     source_type: Optional[str] = Query(None, description="Filter by source type"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items"),
+    cursor: Optional[str] = Query(None, description="Id of the last item already shown; returns the items after it")
 ) -> List[Dict[str, Any]]:
     """
     Get activity timeline showing captured data over time.
 
+    Pages are keyset-based: pass the ``id`` of the last item received as
+    ``cursor`` to continue where it left off, without re-reading the rows
+    before it.
+
     Args:
         days: Number of days to look back
         source_type: Optional filter by source type (screen, clipboard, file)
         limit: Maximum number of results
+        cursor: Optional id of the last item of the previous page
 
     Returns:
         List of timeline items with content, timestamp, and metadata
     """
-    import sqlite3
-
-    conn = sqlite3.connect(store.db_path)
-    cursor = conn.cursor()
-
-    # Calculate date threshold
-    threshold = (datetime.now() - timedelta(days=days)).isoformat()
-
-    results = []
-
-    # Query semantic_content table
-    if source_type and source_type != 'screen':
-        cursor.execute("""
-            SELECT id, content, source_type, source_id, timestamp, metadata
-            FROM semantic_content
-            WHERE timestamp >= ? AND source_type = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (threshold, source_type, limit))
-    elif not source_type:
-        cursor.execute("""
-            SELECT id, content, source_type, source_id, timestamp, metadata
-            FROM semantic_content
-            WHERE timestamp >= ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (threshold, limit))
-
+    conn = store.get_conn()
+
+    # Calculate date threshold: epoch milliseconds for semantic_content,
+    # ISO text for the captures table
+    since = datetime.now() - timedelta(days=days)
+    threshold = since.isoformat()
+    threshold_ms = int(since.timestamp() * 1000)
+
+    # Keyset bounds; the defaults admit every row. The merge below puts
+    # semantic_content first among equal timestamps, which decides whether
+    # the other source's ties were already returned.
+    semantic_bound, semantic_max_ts = (_MAX_ROWID_KEY, '\uffff')
+    capture_bound = ('\uffff', _MAX_ROWID_KEY[1])
+    if cursor:
+        semantic_bound, semantic_max_ts, capture_bound = _timeline_cursor_bounds(conn, cursor)
+
+    sources = []
+
+    # Query semantic_content table. Only the displayed prefix of each
+    # content blob is fetched; its full length decides the "..." suffix.
     if source_type != 'screen':
-        for row in cursor.fetchall():
-            results.append({
-                'id': row[0],
-                'content': row[1][:500] + "..." if len(row[1]) > 500 else row[1],
-                'content_preview': row[1][:200] + "..." if len(row[1]) > 200 else row[1],
-                'source_type': row[2],
-                'source_id': row[3],
-                'timestamp': row[4],
-                'metadata': json.loads(row[5]) if row[5] else {}
-            })
+        if source_type:
+            semantic_rows = conn.execute("""
+                SELECT id, substr(content, 1, 500), length(content),
+                       source_type, source_id, timestamp, metadata
+                FROM semantic_content
+                WHERE timestamp_ms >= ? AND source_type = ?
+                  AND (timestamp_ms, id) < (?, ?) AND timestamp < ?
+                ORDER BY timestamp_ms DESC, id DESC
+                LIMIT ?
+            """, (threshold_ms, source_type, *semantic_bound, semantic_max_ts, limit))
+        else:
+            semantic_rows = conn.execute("""
+                SELECT id, substr(content, 1, 500), length(content),
+                       source_type, source_id, timestamp, metadata
+                FROM semantic_content
+                WHERE timestamp_ms >= ?
+                  AND (timestamp_ms, id) < (?, ?) AND timestamp < ?
+                ORDER BY timestamp_ms DESC, id DESC
+                LIMIT ?
+            """, (threshold_ms, *semantic_bound, semantic_max_ts, limit))
+        sources.append(map(_timeline_item, semantic_rows))
 
     # Query captures table (screen captures)
     if source_type == 'screen' or not source_type:
         try:
-            cursor.execute("""
-                SELECT id, extracted_text, timestamp, active_window, active_app, metadata
+            capture_rows = conn.execute("""
+                SELECT id, coalesce(substr(extracted_text, 1, 500), ''),
+                       coalesce(length(extracted_text), 0), timestamp,
+                       active_window, active_app, screen_width, screen_height,
+                       text_length, metadata
                 FROM captures
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
+                WHERE timestamp >= ? AND (timestamp, id) < (?, ?)
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
-            """, (threshold, limit))
-
-            for row in cursor.fetchall():
-                content = row[1] or ""
-                results.append({
-                    'id': f"screen_{row[0]}",
-                    'content': content[:500] + "..." if len(content) > 500 else content,
-                    'content_preview': content[:200] + "..." if len(content) > 200 else content,
-                    'source_type': 'screen',
-                    'source_id': row[0],
-                    'timestamp': row[2],
-                    'metadata': {
-                        'active_window': row[3],
-                        'active_app': row[4],
-                        **(json.loads(row[5]) if row[5] else {})
-                    }
-                })
+            """, (threshold, *capture_bound, limit))
+            sources.append(map(_capture_timeline_item, capture_rows))
         except sqlite3.OperationalError:
             # captures table doesn't exist yet
             pass
 
-    # Sort all results by timestamp
-    results.sort(key=lambda x: x['timestamp'], reverse=True)
+    # Both sources are already newest first; merge them lazily so only the
+    # rows that make the combined limit are turned into dicts
+    merged = heapq.merge(*sources, key=operator.itemgetter('timestamp'), reverse=True)
+    return list(itertools.islice(merged, limit))
 
-    # Apply limit to combined results
-    results = results[:limit]
 
-    conn.close()
-    return results
+# Sorts after every real (timestamp_ms, id) key
+_MAX_ROWID_KEY = (2 ** 63 - 1, 2 ** 63 - 1)
 
 
-@app.get("/api/search")
-async def search_content(
-    q: str = Query(..., min_length=1, description="Search query"),
-    source_type: Optional[str] = Query(None, description="Filter by source type"),
-    semantic: bool = Query(False, description="Use semantic search"),
-    limit: int = Query(20, ge=1, le=100, description="Maximum results")
-) -> Dict[str, Any]:
+def _timeline_cursor_bounds(conn: sqlite3.Connection, cursor: str) -> tuple:
     """
-    Search across all captured data using full-text or semantic search.
+    Translate a timeline item id into exclusive keyset bounds per source.
+
+    Args:
+        conn: Database connection
+        cursor: Id of the last timeline item seen ("42" or "screen_42")
+
+    Returns:
+        ((timestamp_ms, id) bound and max ISO timestamp for semantic_content,
+        (timestamp, id) bound for captures)
+
+    Raises:
+        HTTPException: If the cursor does not name an existing item
+    """
+    try:
+        if cursor.startswith('screen_'):
+            item_id = int(cursor[len('screen_'):])
+            row = conn.execute("SELECT timestamp FROM captures WHERE id = ?", (item_id,)).fetchone()
+        else:
+            item_id = int(cursor)
+            row = conn.execute("SELECT timestamp, timestamp_ms FROM semantic_content WHERE id = ?",
+                               (item_id,)).fetchone()
+    except (ValueError, sqlite3.OperationalError):
+        row = None
+    if row is None:
+        raise HTTPException(status_code=400, detail=f"Unknown cursor: {cursor}")
+
+    timestamp = row[0]
+    if cursor.startswith('screen_'):
+        # Semantic rows with this exact timestamp were merged ahead of it;
+        # the millisecond bound keeps their scan on the index
+        moment = datetime.fromisoformat(timestamp)
+        timestamp_ms = int(moment.timestamp()) * 1000 + moment.microsecond // 1000
+        return ((timestamp_ms, _MAX_ROWID_KEY[1]), timestamp, (timestamp, item_id))
+    # Captures with this exact timestamp come after it in the merge
+    return ((row[1], item_id), '\uffff', (timestamp, _MAX_ROWID_KEY[1]))
+
+
+def _text_search(q: str, source_type: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    """
+    Full-text search across stored content and screen captures.
 
     Args:
         q: Search query
         source_type: Optional filter by source type
-        semantic: Use semantic/vector search instead of text search
         limit: Maximum number of results
 
     Returns:
-        Dictionary with search results and metadata
+        Matching items, newest first
     """
-    import sqlite3
-
     results = []
 
     # Search semantic_content using store methods
-    if semantic:
-        results = store.semantic_search(q, limit=limit)
-    else:
-        if source_type and source_type != 'screen':
-            results = store.search(q, source_type=source_type, limit=limit)
-        elif not source_type:
-            results = store.search(q, limit=limit)
-
-    # Also search captures table (screen captures) for text search
-    if not semantic and (source_type == 'screen' or not source_type):
-        conn = sqlite3.connect(store.db_path)
+    if source_type and source_type != 'screen':
+        results = store.search(q, source_type=source_type, limit=limit)
+    elif not source_type:
+        results = store.search(q, limit=limit)
+
+    # Also search captures table (screen captures)
+    if source_type == 'screen' or not source_type:
+        conn = store.get_conn()
         cursor = conn.cursor()
 
         try:
             cursor.execute("""
-                SELECT c.id, c.timestamp, c.extracted_text, c.active_window, c.active_app, c.metadata
+                SELECT c.id, c.timestamp, c.extracted_text, c.active_window, c.active_app,
+                       c.screen_width, c.screen_height, c.text_length, c.metadata
                 FROM captures c
                 JOIN captures_fts fts ON c.id = fts.rowid
                 WHERE captures_fts MATCH ?
                 ORDER BY c.timestamp DESC
                 LIMIT ?
-            """, (q, limit))
+            """, (fts_query(q), limit))
 
             for row in cursor.fetchall():
                 content = row[2] or ""
@@ -246,32 +464,21 @@ async def search_content(
                     'source_type': 'screen',
                     'source_id': row[0],
                     'timestamp': row[1],
-                    'metadata': {
-                        'active_window': row[3],
-                        'active_app': row[4],
-                        **(json.loads(row[5]) if row[5] else {})
-                    }
+                    'metadata': _capture_metadata(*row[3:9])
                 })
         except sqlite3.OperationalError:
             # captures_fts table doesn't exist yet
             pass
 
-        conn.close()
-
     # Sort by timestamp and limit
     results.sort(key=lambda x: x['timestamp'], reverse=True)
-    results = results[:limit]
-
-    return {
-        'query': q,
-        'search_type': 'semantic' if semantic else 'text',
-        'count': len(results),
-        'results': results
-    }
+    return results[:limit]
 
 
 @app.get("/api/entities")
-async def get_entities(
+@_conditional_get()
+@_ttl_cache(_ENTITY_CACHE_TTL)
+def get_entities(
     entity_type: Optional[str] = Query(None, description="Filter by entity type"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results")
 ) -> Dict[str, Any]:
@@ -310,89 +517,141 @@ async def get_entities(
     }
 
 
-@app.get("/api/entities/people")
-async def get_people(limit: int = Query(50, ge=1, le=200)) -> List[Dict[str, Any]]:
-    """Get all people entities."""
-    entities = store.get_entities(entity_type="person", limit=limit)
+def _aggregate_entity_mentions(entity_type: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Most-mentioned entities of one type with their three latest contexts.
 
-    # Aggregate by person name
-    people = defaultdict(lambda: {'name': '', 'mentions': 0, 'contexts': [], 'last_seen': None})
+    Args:
+        entity_type: Entity type to aggregate (person, org, ...)
+        limit: Maximum number of entities
 
-    for entity in entities:
-        name = entity['text']
-        people[name]['name'] = name
-        people[name]['mentions'] += 1
-        people[name]['contexts'].append({
-            'content_id': entity['content_id'],
-            'context': entity['context'],
-            'timestamp': entity['timestamp'],
-            'source_type': entity['source_type']
-        })
+    Returns:
+        List of {name, mentions, contexts, last_seen}, most mentioned first
+    """
+    cursor = store.get_conn().cursor()
 
-        # Update last seen
-        if not people[name]['last_seen'] or entity['timestamp'] > people[name]['last_seen']:
-            people[name]['last_seen'] = entity['timestamp']
+    cursor.execute("""
+        SELECT e.entity_text, COUNT(*) AS mentions, MAX(c.timestamp) AS last_seen
+        FROM entities e
+        JOIN semantic_content c ON e.content_id = c.id
+        WHERE e.entity_type = ?
+        GROUP BY e.entity_text
+        ORDER BY mentions DESC, last_seen DESC
+        LIMIT ?
+    """, (entity_type, limit))
 
-    # Sort by mention count
-    result = sorted(people.values(), key=lambda x: x['mentions'], reverse=True)
+    result = []
+    by_name = {}
+    for name, mentions, last_seen in cursor.fetchall():
+        entry = {'name': name, 'mentions': mentions, 'contexts': [], 'last_seen': last_seen}
+        result.append(entry)
+        by_name[name] = entry
 
-    # Limit contexts to most recent 3
-    for person in result:
-        person['contexts'] = sorted(person['contexts'], key=lambda x: x['timestamp'], reverse=True)[:3]
+    # Only the three most recent mentions of each returned name
+    cursor.execute("""
+        SELECT entity_text, content_id, context, length, timestamp, source_type
+        FROM (
+            SELECT e.entity_text, e.content_id,
+                   substr(c.content, 1, 200) AS context, length(c.content) AS length,
+                   c.timestamp, c.source_type,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY e.entity_text ORDER BY c.timestamp DESC
+                   ) AS rn
+            FROM entities e
+            JOIN semantic_content c ON e.content_id = c.id
+            WHERE e.entity_type = ?
+              AND e.entity_text IN (SELECT value FROM json_each(?))
+        )
+        WHERE rn <= 3
+        ORDER BY entity_text, rn
+    """, (entity_type, json.dumps(list(by_name))))
+
+    for name, content_id, context, length, timestamp, source_type in cursor.fetchall():
+        by_name[name]['contexts'].append({
+            'content_id': content_id,
+            'context': _preview(context, length, 200),
+            'timestamp': timestamp,
+            'source_type': source_type
+        })
 
     return result
 
 
-@app.get("/api/entities/organizations")
-async def get_organizations(limit: int = Query(50, ge=1, le=200)) -> List[Dict[str, Any]]:
-    """Get all organization entities."""
-    entities = store.get_entities(entity_type="org", limit=limit)
+@app.get("/api/entities/people")
+@_ttl_cache(_ENTITY_CACHE_TTL)
+def get_people(limit: int = Query(50, ge=1, le=200)) -> List[Dict[str, Any]]:
+    """Get all people entities."""
+    return _aggregate_entity_mentions("person", limit)
 
-    # Aggregate by org name
-    orgs = defaultdict(lambda: {'name': '', 'mentions': 0, 'contexts': [], 'last_seen': None})
 
-    for entity in entities:
-        name = entity['text']
-        orgs[name]['name'] = name
-        orgs[name]['mentions'] += 1
-        orgs[name]['contexts'].append({
-            'content_id': entity['content_id'],
-            'context': entity['context'],
-            'timestamp': entity['timestamp'],
-            'source_type': entity['source_type']
-        })
+@app.get("/api/entities/organizations")
+@_ttl_cache(_ENTITY_CACHE_TTL)
+def get_organizations(limit: int = Query(50, ge=1, le=200)) -> List[Dict[str, Any]]:
+    """Get all organization entities."""
+    return _aggregate_entity_mentions("org", limit)
 
-        # Update last seen
-        if not orgs[name]['last_seen'] or entity['timestamp'] > orgs[name]['last_seen']:
-            orgs[name]['last_seen'] = entity['timestamp']
 
-    # Sort by mention count
-    result = sorted(orgs.values(), key=lambda x: x['mentions'], reverse=True)
+# Helper threads for /api/stats' independent queries
+_stats_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="stats")
 
-    # Limit contexts to most recent 3
-    for org in result:
-        org['contexts'] = sorted(org['contexts'], key=lambda x: x['timestamp'], reverse=True)[:3]
 
-    return result
+def _semantic_activity(day_ago: datetime, week_ago: datetime) -> List[tuple]:
+    """
+    Bucket the last week of semantic_content by (day, hour) in one scan.
 
+    Returns:
+        (day, hour, count, count within the last 24 hours) rows
+    """
+    return store.get_conn().execute("""
+        SELECT DATE(timestamp) AS day, strftime('%H', timestamp) AS hour,
+               COUNT(*), SUM(timestamp_ms >= ?)
+        FROM semantic_content
+        WHERE timestamp_ms >= ?
+        GROUP BY day, hour
+    """, (int(day_ago.timestamp() * 1000), int(week_ago.timestamp() * 1000))).fetchall()
 
-@app.get("/api/stats")
-async def get_stats() -> Dict[str, Any]:
-    """Get overall statistics about captured data."""
-    stats = store.get_stats()
 
-    # Get time-based stats
-    import sqlite3
-    conn = sqlite3.connect(store.db_path)
-    cursor = conn.cursor()
+def _capture_activity(day_ago: datetime, week_ago: datetime) -> tuple[int, List[tuple]]:
+    """
+    Count screen captures and bucket their last week like _semantic_activity.
 
-    # Get screen capture count
-    screen_count = 0
+    Returns:
+        Total capture count and (day, hour, count, recent count) rows
+    """
+    conn = store.get_conn()
     try:
-        cursor.execute("SELECT COUNT(*) FROM captures")
-        screen_count = cursor.fetchone()[0]
+        (count,) = conn.execute("SELECT COUNT(*) FROM captures").fetchone()
+        buckets = conn.execute("""
+            SELECT DATE(timestamp) AS day, strftime('%H', timestamp) AS hour,
+                   COUNT(*), SUM(timestamp >= ?)
+            FROM captures
+            WHERE timestamp >= ?
+            GROUP BY day, hour
+        """, (day_ago.isoformat(), week_ago.isoformat())).fetchall()
     except sqlite3.OperationalError:
-        pass
+        # captures table doesn't exist yet
+        return 0, []
+    return count, buckets
+
+
+@app.get("/api/stats")
+@_conditional_get(rolling=True)
+@_ttl_cache(_STATS_CACHE_TTL)
+def get_stats() -> Dict[str, Any]:
+    """Get overall statistics about captured data."""
+    # Range bounds, in local time like the stored timestamps
+    now = datetime.now()
+    week_ago = now - timedelta(days=7)
+    day_ago = now - timedelta(days=1)
+
+    # The three groups of queries are independent; run two of them on
+    # helper threads (each with its own connection) while this thread
+    # does the third
+    stats_future = _stats_executor.submit(store.get_stats)
+    captures_future = _stats_executor.submit(_capture_activity, day_ago, week_ago)
+    buckets = _semantic_activity(day_ago, week_ago)
+    stats = stats_future.result()
+    screen_count, capture_buckets = captures_future.result()
 
     # Update stats with screen captures
     if 'by_source' not in stats:
@@ -400,65 +659,18 @@ async def get_stats() -> Dict[str, Any]:
     stats['by_source']['screen'] = screen_count
     stats['total_content'] = stats.get('total_content', 0) + screen_count
 
-    # Content by day (last 7 days) - combine semantic_content and captures
-    daily_counts = {}
-
-    # Get from semantic_content
-    cursor.execute("""
-        SELECT DATE(timestamp) as day, COUNT(*) as count
-        FROM semantic_content
-        WHERE timestamp >= datetime('now', '-7 days')
-        GROUP BY day
-    """)
-    for row in cursor.fetchall():
-        daily_counts[row[0]] = row[1]
-
-    # Get from captures
-    try:
-        cursor.execute("""
-            SELECT DATE(timestamp) as day, COUNT(*) as count
-            FROM captures
-            WHERE timestamp >= datetime('now', '-7 days')
-            GROUP BY day
-        """)
-        for row in cursor.fetchall():
-            daily_counts[row[0]] = daily_counts.get(row[0], 0) + row[1]
-    except sqlite3.OperationalError:
-        pass
+    # Content by day (last 7 days) and by hour (last 24 hours), combining
+    # semantic_content and captures
+    daily_counts = Counter()
+    hourly_counts = Counter()
+    for day, hour, count, recent in itertools.chain(buckets, capture_buckets):
+        daily_counts[day] += count
+        if recent:
+            hourly_counts[int(hour)] += recent
 
     daily_activity = [{'date': k, 'count': v} for k, v in sorted(daily_counts.items())]
-
-    # Content by hour (last 24 hours) - combine semantic_content and captures
-    hourly_counts = {}
-
-    # Get from semantic_content
-    cursor.execute("""
-        SELECT strftime('%H', timestamp) as hour, COUNT(*) as count
-        FROM semantic_content
-        WHERE timestamp >= datetime('now', '-1 day')
-        GROUP BY hour
-    """)
-    for row in cursor.fetchall():
-        hourly_counts[int(row[0])] = row[1]
-
-    # Get from captures
-    try:
-        cursor.execute("""
-            SELECT strftime('%H', timestamp) as hour, COUNT(*) as count
-            FROM captures
-            WHERE timestamp >= datetime('now', '-1 day')
-            GROUP BY hour
-        """)
-        for row in cursor.fetchall():
-            hour = int(row[0])
-            hourly_counts[hour] = hourly_counts.get(hour, 0) + row[1]
-    except sqlite3.OperationalError:
-        pass
-
     hourly_activity = [{'hour': k, 'count': v} for k, v in sorted(hourly_counts.items())]
 
-    conn.close()
-
     return {
         **stats,
         'daily_activity': daily_activity,
@@ -467,143 +679,153 @@ async def get_stats() -> Dict[str, Any]:
 
 
 @app.get("/api/relationships")
-async def get_relationships(limit: int = Query(50, ge=1, le=200)) -> Dict[str, Any]:
+@_ttl_cache(_ENTITY_CACHE_TTL)
+def get_relationships(limit: int = Query(50, ge=1, le=200)) -> Dict[str, Any]:
     """
     Get relationship graph data showing connections between entities.
 
     Returns nodes (entities) and edges (co-occurrences in same content).
     """
-    import sqlite3
-
-    conn = sqlite3.connect(store.db_path)
+    conn = store.get_conn()
     cursor = conn.cursor()
 
-    # Get all entities with their content_id
+    # Top entities by mention count
     cursor.execute("""
-        SELECT content_id, entity_text, entity_type
+        SELECT entity_text, entity_type, COUNT(*) AS count
         FROM entities
-        ORDER BY content_id
+        GROUP BY entity_text
+        ORDER BY count DESC
         LIMIT ?
-    """, (limit * 10,))
-
-    entity_data = cursor.fetchall()
-    conn.close()
-
-    # Build nodes and edges
-    nodes = {}
-    edges = defaultdict(int)
-
-    # Group entities by content_id
-    content_entities = defaultdict(list)
-    for content_id, entity_text, entity_type in entity_data:
-        content_entities[content_id].append((entity_text, entity_type))
-
-        # Add to nodes
-        if entity_text not in nodes:
-            nodes[entity_text] = {
-                'id': entity_text,
-                'label': entity_text,
-                'type': entity_type,
-                'count': 0
-            }
-        nodes[entity_text]['count'] += 1
-
-    # Find co-occurrences
-    for content_id, entities_list in content_entities.items():
-        # Only process content with multiple entities
-        if len(entities_list) < 2:
-            continue
-
-        # Create edges between all pairs
-        for i, (e1_text, e1_type) in enumerate(entities_list):
-            for e2_text, e2_type in entities_list[i+1:]:
-                # Sort to ensure consistent edge key
-                edge_key = tuple(sorted([e1_text, e2_text]))
-                edges[edge_key] += 1
-
-    # Convert to list format
-    nodes_list = list(nodes.values())
+    """, (limit,))
+
+    nodes_list = [
+        {
+            'id': entity_text,
+            'label': entity_text,
+            'type': entity_type,
+            'count': count
+        }
+        for entity_text, entity_type, count in cursor.fetchall()
+    ]
+
+    # Co-occurrences between those entities: fetch their mentions grouped
+    # by content and count every pair of distinct names per content item
+    cursor.execute("""
+        SELECT content_id, entity_text
+        FROM entities
+        WHERE entity_text IN (SELECT value FROM json_each(?))
+        ORDER BY content_id
+    """, (json.dumps([node['id'] for node in nodes_list]),))
+
+    edges = Counter()
+    for _, group in itertools.groupby(cursor.fetchall(), key=operator.itemgetter(0)):
+        edges.update(
+            pair for pair in itertools.combinations(sorted(row[1] for row in group), 2)
+            if pair[0] != pair[1]
+        )
+
     edges_list = [
         {
             'source': source,
             'target': target,
             'weight': weight
         }
-        for (source, target), weight in edges.items()
-        if weight > 0  # Only include edges with at least 1 co-occurrence
+        for (source, target), weight in edges.most_common(100)
     ]
 
-    # Limit nodes to top ones by count
-    nodes_list = sorted(nodes_list, key=lambda x: x['count'], reverse=True)[:limit]
-
-    # Filter edges to only include nodes in our limited set
-    node_ids = {n['id'] for n in nodes_list}
-    edges_list = [e for e in edges_list if e['source'] in node_ids and e['target'] in node_ids]
-
     return {
         'nodes': nodes_list,
-        'edges': edges_list[:100]  # Limit edges for performance
+        'edges': edges_list
     }
 
 
-@app.get("/api/content/{content_id}")
-async def get_content_detail(content_id: int) -> Dict[str, Any]:
-    """Get detailed information about a specific content item."""
-    import sqlite3
-
-    conn = sqlite3.connect(store.db_path)
-    cursor = conn.cursor()
+# Content rows with their entities aggregated into one JSON column
+_CONTENT_DETAIL_SQL = """
+    SELECT c.id, c.content, c.source_type, c.source_id, c.timestamp, c.metadata,
+           (SELECT json_group_array(json_object(
+                       'text', entity_text, 'type', entity_type,
+                       'start', start_char, 'end', end_char))
+            FROM (SELECT entity_text, entity_type, start_char, end_char
+                  FROM entities
+                  WHERE content_id = c.id
+                  ORDER BY start_char))
+    FROM semantic_content c
+"""
 
-    # Get content
-    cursor.execute("""
-        SELECT id, content, source_type, source_id, timestamp, metadata
-        FROM semantic_content
-        WHERE id = ?
-    """, (content_id,))
+# Most content items /api/content returns in one call
+_CONTENT_BATCH_MAX = 200
 
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Content not found")
 
-    content_data = {
+def _content_detail_item(row: tuple) -> Dict[str, Any]:
+    """Build a content detail dict from a _CONTENT_DETAIL_SQL row."""
+    return {
         'id': row[0],
         'content': row[1],
         'source_type': row[2],
         'source_id': row[3],
         'timestamp': row[4],
-        'metadata': json.loads(row[5]) if row[5] else {}
+        'metadata': _json_loads(row[5]) if row[5] else {},
+        'entities': _json_loads(row[6])
     }
 
-    # Get associated entities
-    cursor.execute("""
-        SELECT entity_text, entity_type, start_char, end_char
-        FROM entities
-        WHERE content_id = ?
-        ORDER BY start_char
-    """, (content_id,))
 
-    content_data['entities'] = [
-        {
-            'text': row[0],
-            'type': row[1],
-            'start': row[2],
-            'end': row[3]
-        }
-        for row in cursor.fetchall()
-    ]
+@app.get("/api/content")
+def get_content_batch(
+    ids: str = Query(..., description="Comma-separated content ids")
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get detailed information about several content items in one query.
 
-    conn.close()
-    return content_data
+    Args:
+        ids: Comma-separated content ids
 
+    Returns:
+        Content details keyed by id; unknown ids are omitted
+    """
+    try:
+        content_ids = sorted({int(part) for part in ids.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(content_ids) > _CONTENT_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {_CONTENT_BATCH_MAX} ids per request")
+
+    rows = store.get_conn().execute(
+        _CONTENT_DETAIL_SQL + "WHERE c.id IN (SELECT value FROM json_each(?))",
+        (json.dumps(content_ids),)
+    )
+    return {str(row[0]): _content_detail_item(row) for row in rows}
 
-# === Capture Daemon Control ===
-import subprocess
-import signal
 
+@app.get("/api/content/{content_id}")
+def get_content_detail(content_id: int) -> Dict[str, Any]:
+    """Get detailed information about a specific content item."""
+    row = store.get_conn().execute(
+        _CONTENT_DETAIL_SQL + "WHERE c.id = ?", (content_id,)
+    ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Content not found")
+
+    return _content_detail_item(row)
+
+
+# === Capture Daemon Control ===
 # Track running capture processes
 capture_processes: Dict[str, subprocess.Popen] = {}
 
+# Status subscribers wait on this event; it is swapped for a fresh one each
+# time the dashboard starts or stops a daemon.
+_capture_status_changed = asyncio.Event()
+# Daemons can also exit on their own, so subscribers re-check this often
+_CAPTURE_STATUS_RECHECK = 5.0
+
+
+def _notify_capture_status() -> None:
+    """Wake every capture status subscriber."""
+    global _capture_status_changed
+    changed, _capture_status_changed = _capture_status_changed, asyncio.Event()
+    changed.set()
+
+
 @app.get("/api/capture/status")
 async def get_capture_status() -> Dict[str, Any]:
     """Get the status of all capture daemons."""
@@ -642,7 +864,6 @@ async def start_capture_daemon(daemon_name: str) -> Dict[str, Any]:
     }
     
     # Start the daemon
-    import sys
     venv_python = Path(__file__).parent.parent.parent.parent / "venv" / "bin" / "python"
     python_exe = str(venv_python) if venv_python.exists() else sys.executable
     
@@ -653,6 +874,7 @@ async def start_capture_daemon(daemon_name: str) -> Dict[str, Any]:
         stderr=subprocess.DEVNULL
     )
     capture_processes[daemon_name] = proc
+    _notify_capture_status()
     
     return {"status": "started", "pid": proc.pid}
 
@@ -675,9 +897,74 @@ async def stop_capture_daemon(daemon_name: str) -> Dict[str, Any]:
         proc.kill()
     
     capture_processes[daemon_name] = None
+    _notify_capture_status()
     return {"status": "stopped"}
 
 
+async def _capture_status_updates(until: Optional[asyncio.Future] = None):
+    """
+    Yield the capture daemon status now and again each time it changes.
+
+    Args:
+        until: Stop once this future is done (e.g. the client disconnected)
+    """
+    last_status = None
+    while until is None or not until.done():
+        changed = _capture_status_changed
+        status = await get_capture_status()
+        if status != last_status:
+            yield status
+            last_status = status
+        waiter = asyncio.ensure_future(changed.wait())
+        try:
+            await asyncio.wait({waiter} if until is None else {until, waiter},
+                               timeout=_CAPTURE_STATUS_RECHECK,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume client frames until the client goes away."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@app.websocket("/api/capture/status/ws")
+async def capture_status_ws(websocket: WebSocket) -> None:
+    """
+    Push capture daemon status to the client whenever it changes.
+
+    The current status is sent on connect, then again only when it differs
+    from the last message, so an idle subscriber sees no traffic.
+    """
+    await websocket.accept()
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        async for status in _capture_status_updates(until=disconnected):
+            await websocket.send_json(status)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+
+
+@app.get("/api/capture/status/stream")
+async def capture_status_stream() -> StreamingResponse:
+    """
+    Server-sent events carrying capture daemon status whenever it changes.
+
+    Same updates as /api/capture/status/ws, for clients such as a browser
+    EventSource that would rather not speak websocket.
+    """
+    async def events():
+        async for status in _capture_status_updates():
+            yield f"data: {json.dumps(status)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
 @app.post("/api/capture/start-all")
 async def start_all_daemons() -> Dict[str, Any]:
     """Start all capture daemons."""
@@ -699,7 +986,7 @@ async def stop_all_daemons() -> Dict[str, Any]:
 
 
 @app.post("/api/entities/sync")
-async def sync_entities() -> Dict[str, Any]:
+def sync_entities() -> Dict[str, Any]:
     """
     Sync all existing captures and extract entities.
     This processes screen captures, clipboard items, and files.
@@ -726,15 +1013,13 @@ async def sync_entities() -> Dict[str, Any]:
 
 
 @app.post("/api/entities/reprocess")
-async def reprocess_entities() -> Dict[str, Any]:
+def reprocess_entities() -> Dict[str, Any]:
     """
     Re-extract entities from all content in semantic store.
     This is useful if entity extraction was skipped or failed previously.
     """
-    import sqlite3
-    
     try:
-        conn = sqlite3.connect(store.db_path)
+        conn = store.get_conn()
         cursor = conn.cursor()
         
         # Clear existing entities
@@ -767,7 +1052,6 @@ async def reprocess_entities() -> Dict[str, Any]:
                 total_entities += 1
         
         conn.commit()
-        conn.close()
         
         # Get updated stats
         stats = store.get_stats()
@@ -779,6 +1063,8 @@ async def reprocess_entities() -> Dict[str, Any]:
             "by_entity_type": stats.get("by_entity_type", {})
         }
     except Exception as e:
+        # The connection is shared; don't leave a half-applied rebuild open
+        store.get_conn().rollback()
         return {
             "status": "error",
             "message": str(e)
@@ -786,16 +1072,15 @@ async def reprocess_entities() -> Dict[str, Any]:
 
 
 @app.get("/api/graph")
-async def get_graph_data(
+@_ttl_cache(_ENTITY_CACHE_TTL)
+def get_graph_data(
     limit: int = Query(100, ge=10, le=500, description="Max entities to include")
 ) -> Dict[str, Any]:
     """
     Get graph data for entity relationship visualization.
     Returns nodes (entities) and links (co-occurrences in same content).
     """
-    import sqlite3
-    
-    conn = sqlite3.connect(store.db_path)
+    conn = store.get_conn()
     cursor = conn.cursor()
     
     # Get top entities by frequency
@@ -811,47 +1096,39 @@ async def get_graph_data(
     
     # Create nodes
     nodes = []
-    entity_to_id = {}
     for i, (text, etype, freq) in enumerate(entities):
-        node_id = f"e{i}"
-        entity_to_id[(text, etype)] = node_id
         nodes.append({
-            "id": node_id,
+            "id": f"e{i}",
             "label": text,
             "type": etype,
             "size": min(5 + freq * 2, 30),  # Size based on frequency
             "freq": freq
         })
     
-    # Find co-occurrences (entities that appear in same content)
-    links = []
-    link_set = set()
-    
-    # Get content_ids for each entity
-    entity_contents = {}
-    for (text, etype), node_id in entity_to_id.items():
-        cursor.execute("""
-            SELECT DISTINCT content_id FROM entities
-            WHERE entity_text = ? AND entity_type = ?
-        """, (text, etype))
-        entity_contents[node_id] = set(row[0] for row in cursor.fetchall())
-    
-    # Create links based on shared content
-    node_ids = list(entity_to_id.values())
-    for i, src_id in enumerate(node_ids):
-        for tgt_id in node_ids[i+1:]:
-            shared = entity_contents[src_id] & entity_contents[tgt_id]
-            if shared:
-                link_key = tuple(sorted([src_id, tgt_id]))
-                if link_key not in link_set:
-                    link_set.add(link_key)
-                    links.append({
-                        "source": src_id,
-                        "target": tgt_id,
-                        "value": len(shared)  # Strength = number of shared documents
-                    })
-    
-    conn.close()
+    # Find co-occurrences (entities that appear in same content): one
+    # query maps every content item to the node indexes it mentions
+    cursor.execute("""
+        SELECT DISTINCT e.content_id, j.key
+        FROM json_each(?) j
+        JOIN entities e
+          ON e.entity_text = json_extract(j.value, '$[0]')
+         AND e.entity_type = json_extract(j.value, '$[1]')
+        ORDER BY e.content_id, j.key
+    """, (json.dumps([[text, etype] for text, etype, _ in entities]),))
+
+    # Strength = number of shared documents
+    shared_counts = Counter()
+    for _, group in itertools.groupby(cursor.fetchall(), key=lambda row: row[0]):
+        shared_counts.update(itertools.combinations([row[1] for row in group], 2))
+
+    links = [
+        {
+            "source": f"e{src}",
+            "target": f"e{tgt}",
+            "value": shared
+        }
+        for (src, tgt), shared in sorted(shared_counts.items())
+    ]
     
     return {
         "nodes": nodes,
@@ -895,20 +1172,55 @@ def get_default_settings() -> Dict[str, Any]:
         "onboardingComplete": False,
     }
 
+# Last parsed settings file, keyed by its (mtime_ns, size)
+_settings_cache: Optional[tuple[tuple[int, int], Dict[str, Any]]] = None
+
 def load_settings() -> Dict[str, Any]:
-    """Load settings from file or return defaults."""
+    """Load settings from file or return defaults.
+
+    The parsed file is cached until its mtime or size changes; callers get
+    a copy they are free to mutate.
+    """
+    global _settings_cache
+    try:
+        stat = SETTINGS_FILE.stat()
+    except OSError:
+        return get_default_settings()
+    key = (stat.st_mtime_ns, stat.st_size)
     try:
-        if SETTINGS_FILE.exists():
-            return json.loads(SETTINGS_FILE.read_text())
+        if _settings_cache is None or _settings_cache[0] != key:
+            _settings_cache = (key, _json_loads(SETTINGS_FILE.read_bytes()))
+        return copy.deepcopy(_settings_cache[1])
     except Exception:
-        pass
-    return get_default_settings()
+        return get_default_settings()
+
+# Digest of the last bytes written, with the file's (mtime_ns, size) after
+# the write so edits made outside the dashboard are not mistaken for ours
+_last_saved: Optional[tuple[bytes, tuple[int, int]]] = None
 
 def save_settings(settings: Dict[str, Any]) -> bool:
-    """Save settings to file."""
+    """Save settings to file.
+
+    Saving unchanged settings is a no-op. Otherwise the file is replaced
+    atomically, so a crash mid-write never leaves a truncated file behind.
+    """
+    global _last_saved
     try:
+        data = json.dumps(settings, indent=2).encode()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        try:
+            stat = SETTINGS_FILE.stat()
+            if _last_saved == (digest, (stat.st_mtime_ns, stat.st_size)):
+                return True
+        except OSError:
+            pass
+
         SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        SETTINGS_FILE.write_text(json.dumps(settings, indent=2))
+        tmp = SETTINGS_FILE.with_suffix(".json.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, SETTINGS_FILE)
+        stat = SETTINGS_FILE.stat()
+        _last_saved = (digest, (stat.st_mtime_ns, stat.st_size))
         return True
     except Exception:
         return False
@@ -946,7 +1258,7 @@ async def reset_settings() -> Dict[str, Any]:
 
 # === Browser Extension API ===
 @app.post("/api/browser/add")
-async def add_browser_history(data: Dict[str, Any]) -> Dict[str, Any]:
+def add_browser_history(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Add browser history from extension.
     Expected: { url, title, content?, timestamp? }
@@ -966,12 +1278,11 @@ async def add_browser_history(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @app.get("/api/browser/history")
-async def get_browser_history(
+def get_browser_history(
     limit: int = Query(50, ge=1, le=200)
 ) -> Dict[str, Any]:
     """Get browser history from semantic store."""
-    import sqlite3
-    conn = sqlite3.connect(store.db_path)
+    conn = store.get_conn()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -983,7 +1294,7 @@ async def get_browser_history(
     
     items = []
     for row in cursor.fetchall():
-        meta = json.loads(row[3]) if row[3] else {}
+        meta = _json_loads(row[3]) if row[3] else {}
         items.append({
             "id": row[0],
             "url": meta.get("url", ""),
@@ -991,7 +1302,6 @@ async def get_browser_history(
             "timestamp": row[2],
         })
     
-    conn.close()
     return {"items": items, "count": len(items)}
 
 
@@ -1014,7 +1324,6 @@ async def execute_action(data: Dict[str, Any]) -> Dict[str, Any]:
     if action == "open_file":
         path = params.get("path", "")
         if path:
-            import subprocess
             subprocess.run(["open", path])
             results.append(f"Opened: {path}")
     
@@ -1026,7 +1335,6 @@ async def execute_action(data: Dict[str, Any]) -> Dict[str, Any]:
     
     elif action == "summarize_today":
         # Get today's captures and summarize
-        from datetime import datetime
         today = datetime.now().strftime("%Y-%m-%d")
         search_results = store.search(f'"{today}"', limit=20)
         results.append(f"Found {len(search_results)} items from today")
@@ -1038,19 +1346,33 @@ async def execute_action(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 # === Catch-all route for SPA (must be last) ===
+# index.html bytes, keyed by the file's (mtime_ns, size) so a rebuild is
+# picked up without a restart
+_index_cache: Optional[tuple[tuple[int, int], bytes]] = None
+
 @app.get("/{full_path:path}")
 async def serve_react_app(full_path: str):
-    """Serve the React app for any unmatched route (SPA support)."""
+    """Serve the React app for any unmatched route (SPA support).
+
+    index.html is held in memory and always revalidated by the browser
+    (it names the current hashed asset bundles).
+    """
+    global _index_cache
     index_path = DIST_DIR / "index.html"
-    if not index_path.exists():
+    try:
+        stat = index_path.stat()
+    except OSError:
         return HTMLResponse("""
             <html><body>
                 <h1>Frontend Build Not Found</h1>
                 <p>Please run 'npm run build' in src/interface/web first.</p>
             </body></html>
         """, status_code=404)
-        
-    return FileResponse(index_path)
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _index_cache is None or _index_cache[0] != key:
+        _index_cache = (key, index_path.read_bytes())
+    return HTMLResponse(_index_cache[1], headers={"Cache-Control": "no-cache"})
 
 
 if __name__ == "__main__":
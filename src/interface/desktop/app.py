@@ -20,20 +20,52 @@ from src.interface.desktop.autostart import is_autostart_enabled, toggle_autosta
 PORT = 8000
 HOST = "127.0.0.1"
 URL = f"http://{HOST}:{PORT}"
+_SERVER_READY_TIMEOUT = 5.0
+_SERVER_POLL_INTERVAL = 0.02
 
 # Global references
 window = None
 tray = None
+server = None
 server_thread = None
 
 
 def start_server():
-    """Start the FastAPI server in a separate thread."""
-    config = uvicorn.Config(app, host=HOST, port=PORT, log_level="error")
+    """Start the FastAPI server in a separate thread.
+
+    uvicorn's "auto" loop and HTTP implementations pick uvloop and httptools
+    when installed and fall back to asyncio/h11 (e.g. on Windows).
+    """
+    global server
+    config = uvicorn.Config(app, host=HOST, port=PORT, log_level="error",
+                            loop="auto", http="auto", access_log=False)
     server = uvicorn.Server(config)
     server.run()
 
 
+def wait_for_server(timeout: float = _SERVER_READY_TIMEOUT) -> bool:
+    """Block until uvicorn is accepting connections.
+
+    Polls ``uvicorn.Server.started``, which flips once the socket is bound
+    and startup (lifespan) has completed, so the window never loads a page
+    from a server that isn't listening yet.
+
+    Args:
+        timeout: Maximum number of seconds to wait.
+
+    Returns:
+        True if the server came up, False on timeout or if it exited.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.started:
+            return True
+        if server_thread is not None and not server_thread.is_alive():
+            return False
+        time.sleep(_SERVER_POLL_INTERVAL)
+    return False
+
+
 def show_window():
     """Show or focus the main window."""
     global window
@@ -75,8 +107,8 @@ def main():
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
     
-    # Wait for server to start
-    time.sleep(1.5)
+    if not wait_for_server():
+        print(f"⚠️  Server did not report ready within {_SERVER_READY_TIMEOUT:.0f}s")
     
     # Create system tray icon
     tray = TrayIcon(
@@ -117,7 +149,8 @@ def main_minimal():
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
     
-    time.sleep(1.5)
+    if not wait_for_server():
+        print(f"⚠️  Server did not report ready within {_SERVER_READY_TIMEOUT:.0f}s")
     
     # Create and run system tray (blocks)
     tray = TrayIcon(
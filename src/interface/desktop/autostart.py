@@ -6,10 +6,14 @@ import os
 import sys
 from pathlib import Path
 import platform
+from typing import Callable, NamedTuple
 
 APP_ID = "com.unifiedai.system"
 APP_NAME = "Unified AI System"
 
+# Resolved once; the OS does not change while the app runs
+_SYSTEM = platform.system()
+
 
 def get_launch_command() -> str:
     """Get the command to launch the app."""
@@ -82,36 +86,48 @@ def disable_autostart_macos() -> bool:
         return False
 
 
+def is_autostart_enabled_macos() -> bool:
+    """Check whether the macOS LaunchAgent is installed."""
+    plist_path = Path.home() / "Library" / "LaunchAgents" / f"{APP_ID}.plist"
+    return plist_path.exists()
+
+
+class _AutostartHandlers(NamedTuple):
+    enable: Callable[[], bool]
+    disable: Callable[[], bool]
+    is_enabled: Callable[[], bool]
+
+
+# Platforms with an auto-start implementation
+_HANDLERS = {
+    "Darwin": _AutostartHandlers(
+        enable_autostart_macos, disable_autostart_macos, is_autostart_enabled_macos
+    ),
+}
+
+
 def is_autostart_enabled() -> bool:
     """Check if auto-start is currently enabled."""
-    if platform.system() == "Darwin":
-        plist_path = Path.home() / "Library" / "LaunchAgents" / f"{APP_ID}.plist"
-        return plist_path.exists()
-    return False
+    handlers = _HANDLERS.get(_SYSTEM)
+    return handlers.is_enabled() if handlers else False
 
 
 def enable_autostart() -> bool:
     """Enable auto-start for current platform."""
-    system = platform.system()
-    if system == "Darwin":
-        return enable_autostart_macos()
-    elif system == "Linux":
-        # Linux: Use ~/.config/autostart desktop file
-        print("Linux auto-start not yet implemented")
-        return False
-    elif system == "Windows":
-        # Windows: Use registry or Start Menu startup folder
-        print("Windows auto-start not yet implemented")
-        return False
+    handlers = _HANDLERS.get(_SYSTEM)
+    if handlers:
+        return handlers.enable()
+    if _SYSTEM in ("Linux", "Windows"):
+        # Linux: ~/.config/autostart desktop file; Windows: registry or
+        # Start Menu startup folder
+        print(f"{_SYSTEM} auto-start not yet implemented")
     return False
 
 
 def disable_autostart() -> bool:
     """Disable auto-start for current platform."""
-    system = platform.system()
-    if system == "Darwin":
-        return disable_autostart_macos()
-    return False
+    handlers = _HANDLERS.get(_SYSTEM)
+    return handlers.disable() if handlers else False
 
 
 def toggle_autostart() -> bool:
@@ -2,12 +2,27 @@
 System Tray Module for Unified AI System.
 Provides a menu bar icon with quick access to app controls.
 """
+import json
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image, ImageDraw
 from pystray import Icon, Menu, MenuItem
 
+# Optional: websockets (installed with uvicorn[standard]) lets the server push
+# capture status instead of the tray polling for it
+try:
+    from websockets.sync.client import connect as ws_connect
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
 API_BASE = "http://127.0.0.1:8000"
+STATUS_WS_URL = API_BASE.replace("http", "ws", 1) + "/api/capture/status/ws"
+# HTTP polling interval while the status socket is unavailable; doubles on
+# each failed poll up to the cap and resets once the server answers
+_POLL_INTERVAL = 5
+_MAX_POLL_INTERVAL = 60
 
 
 class TrayIcon:
@@ -19,6 +34,15 @@ class TrayIcon:
         self.icon = None
         self.running = True
         self._status = "stopped"  # stopped, running, partial
+        # Status only ever picks one of three colors; draw each once
+        self._icons = {c: self.create_icon(c) for c in ("#22c55e", "#eab308", "#808080")}
+        # One keep-alive connection shared by status polls and menu actions
+        # (two slots so a menu click never races the updater for the socket)
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._poll_interval = _POLL_INTERVAL
+        # Set by menu actions to refresh status without waiting out the interval
+        self._wake = threading.Event()
     
     def create_icon(self, color: str = "#808080") -> Image.Image:
         """Create a simple circular icon with the given color."""
@@ -40,40 +64,60 @@ class TrayIcon:
         else:
             return "#808080"  # Gray
     
-    def update_status(self):
-        """Check daemon status and update icon."""
+    def _apply_status(self, data: dict):
+        """Derive the overall status from a capture status payload and redraw."""
+        running_count = sum(1 for d in data.values() if isinstance(d, dict) and d.get("running"))
+        total = len([d for d in data.values() if isinstance(d, dict)])
+        
+        if running_count == total and total > 0:
+            self._status = "running"
+        elif running_count > 0:
+            self._status = "partial"
+        else:
+            self._status = "stopped"
+        self._refresh_icon()
+    
+    def _refresh_icon(self):
+        """Update icon color to match the current status."""
+        if self.icon:
+            self.icon.icon = self._icons[self._get_status_color()]
+    
+    def update_status(self) -> bool:
+        """Check daemon status and update icon.
+
+        Returns:
+            True if the server answered
+        """
         try:
-            res = requests.get(f"{API_BASE}/api/capture/status", timeout=2)
-            data = res.json()
-            running_count = sum(1 for d in data.values() if isinstance(d, dict) and d.get("running"))
-            total = len([d for d in data.values() if isinstance(d, dict)])
-            
-            if running_count == total and total > 0:
-                self._status = "running"
-            elif running_count > 0:
-                self._status = "partial"
-            else:
-                self._status = "stopped"
+            res = self._session.get(f"{API_BASE}/api/capture/status", timeout=2)
+            self._apply_status(res.json())
+            return True
         except Exception:
             self._status = "stopped"
-        
-        # Update icon color
-        if self.icon:
-            self.icon.icon = self.create_icon(self._get_status_color())
+            self._refresh_icon()
+            return False
+    
+    def _listen_status(self):
+        """Apply status pushed over the server's websocket until it closes."""
+        with ws_connect(STATUS_WS_URL, open_timeout=2) as ws:
+            for message in ws:
+                if not self.running:
+                    break
+                self._apply_status(json.loads(message))
     
     def _start_captures(self, icon, item):
         """Start all capture daemons."""
         try:
-            requests.post(f"{API_BASE}/api/capture/start-all", timeout=5)
-            self.update_status()
+            self._session.post(f"{API_BASE}/api/capture/start-all", timeout=5)
+            self._wake.set()
         except Exception as e:
             print(f"Failed to start captures: {e}")
     
     def _stop_captures(self, icon, item):
         """Stop all capture daemons."""
         try:
-            requests.post(f"{API_BASE}/api/capture/stop-all", timeout=5)
-            self.update_status()
+            self._session.post(f"{API_BASE}/api/capture/stop-all", timeout=5)
+            self._wake.set()
         except Exception as e:
             print(f"Failed to stop captures: {e}")
     
@@ -85,6 +129,7 @@ class TrayIcon:
     def _quit(self, icon, item):
         """Quit the application."""
         self.running = False
+        self._wake.set()
         icon.stop()
         if self.on_quit:
             self.on_quit()
@@ -101,17 +146,31 @@ class TrayIcon:
         )
     
     def _status_updater(self):
-        """Background thread to update status periodically."""
-        import time
+        """Background thread keeping the icon in sync with the daemons.
+
+        Status is pushed over a websocket when available. Otherwise it is
+        polled, backing off while the server is unreachable; menu actions
+        wake the thread for an immediate refresh.
+        """
         while self.running:
-            self.update_status()
-            time.sleep(5)
+            if WEBSOCKETS_AVAILABLE:
+                try:
+                    self._listen_status()
+                    continue
+                except Exception:
+                    pass
+            if self.update_status():
+                self._poll_interval = _POLL_INTERVAL
+            else:
+                self._poll_interval = min(self._poll_interval * 2, _MAX_POLL_INTERVAL)
+            self._wake.wait(timeout=self._poll_interval)
+            self._wake.clear()
     
     def run(self):
         """Start the system tray icon."""
         self.icon = Icon(
             name="UnifiedAI",
-            icon=self.create_icon(),
+            icon=self._icons[self._get_status_color()],
             title="Unified AI System",
             menu=self._build_menu()
         )
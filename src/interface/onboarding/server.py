@@ -8,16 +8,23 @@ This server provides endpoints for:
 - Sync status monitoring
 """
 
+import asyncio
+import contextlib
+import hashlib
 import os
+import sqlite3
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Set
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, Depends, Header, Response, Request
+from fastapi import FastAPI, HTTPException, Depends, Response, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr
 
 # Add src to path
@@ -31,20 +38,111 @@ from src.onboarding import OnboardingManager, OnboardingStep
 user_manager = UserManager()
 onboarding_manager = OnboardingManager()
 
+
+class _HeartbeatBuffer:
+    """Coalesce client heartbeats in memory and write them in batches.
+
+    Desktop apps and extensions ping every few seconds; recording each
+    ping as its own UPDATE and commit makes write volume grow with the
+    number of clients. Only the latest timestamp per id is kept, and
+    unknown ids are still rejected immediately.
+
+    Args:
+        exists: Returns whether an id is registered
+        write: Applies {id: last seen ISO timestamp} in one transaction
+    """
+
+    def __init__(self, exists: Callable[[str], bool], write: Callable[[Dict[str, str]], int]):
+        self._exists = exists
+        self._write = write
+        self._known: Set[str] = set()
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add_known(self, client_id: str) -> None:
+        """Mark an id as registered so its heartbeats skip the lookup."""
+        self._known.add(client_id)
+
+    def record(self, client_id: str) -> bool:
+        """Buffer a heartbeat. Returns False if the id isn't registered."""
+        if client_id not in self._known:
+            if not self._exists(client_id):
+                return False
+            self._known.add(client_id)
+        with self._lock:
+            self._pending[client_id] = datetime.utcnow().isoformat()
+        return True
+
+    def flush(self) -> int:
+        """Write out buffered heartbeats. Returns the number of rows updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return self._write(pending) if pending else 0
+
+
+_device_heartbeats = _HeartbeatBuffer(
+    onboarding_manager.device_exists, onboarding_manager.update_device_heartbeats
+)
+_extension_heartbeats = _HeartbeatBuffer(
+    onboarding_manager.extension_exists, onboarding_manager.update_extension_heartbeats
+)
+_HEARTBEAT_FLUSH_INTERVAL = 2.0
+
+
+def _flush_heartbeats() -> None:
+    """Write buffered device and extension heartbeats to the database."""
+    for buffer in (_device_heartbeats, _extension_heartbeats):
+        try:
+            buffer.flush()
+        except sqlite3.Error as e:
+            # Heartbeats are refreshed by the next ping; just drop this batch
+            print(f"Warning: failed to flush heartbeats: {e}")
+
+
+async def _flush_heartbeats_periodically() -> None:
+    """Flush buffered heartbeats every _HEARTBEAT_FLUSH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(_HEARTBEAT_FLUSH_INTERVAL)
+        await run_in_threadpool(_flush_heartbeats)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Run the heartbeat flusher, writing out what's left on shutdown."""
+    flusher = asyncio.create_task(_flush_heartbeats_periodically())
+    yield
+    flusher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await flusher
+    _flush_heartbeats()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Unified AI System - Onboarding API",
     description="User onboarding and device registration API",
     version="1.0.0",
+    lifespan=_lifespan,
 )
 
-# Enable CORS
+# Enable CORS. The onboarding page is served by this app (same origin);
+# cross-origin callers are the dashboard/desktop app, its Vite dev server
+# and the browser extension. Auth is a bearer header, so no credentials,
+# and preflights are cached for ten minutes.
+_CORS_ORIGINS = [
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=_CORS_ORIGINS,
+    allow_origin_regex=r"(chrome|moz)-extension://.*",
+    allow_methods=["GET", "POST", "PATCH"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=600,
 )
 
 
@@ -108,11 +206,66 @@ class ExtensionSettings(BaseModel):
 # Authentication Helpers
 # ============================================================================
 
-async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
+# The managers open a SQLite connection per call (and hash passwords), so
+# every handler and dependency that touches them is a plain ``def``: FastAPI
+# runs those in its threadpool instead of blocking the event loop.
+
+# Validated sessions are reused for this long (never past the session's own
+# expiry) instead of querying the users database on every authenticated
+# request. Logout through this process evicts the token at once; a session
+# deleted by another process is honoured for at most the TTL.
+_SESSION_CACHE_TTL = 60.0
+_SESSION_CACHE_SIZE = 10_000
+_session_cache: Dict[str, tuple[float, User]] = {}
+_session_cache_lock = threading.Lock()
+
+
+def _cached_session_user(token: str) -> Optional[User]:
+    """Return the user for a recently validated token, if still fresh."""
+    cached = _session_cache.get(token)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    return None
+
+
+def _cache_session_user(token: str, user: User, expires_at: str) -> None:
+    """Remember a validated token, dropping the oldest entry when full.
+
+    Args:
+        token: Session token
+        user: The session's user
+        expires_at: Session expiry as a UTC ISO timestamp
+    """
+    remaining = (datetime.fromisoformat(expires_at) - datetime.utcnow()).total_seconds()
+    deadline = time.monotonic() + min(_SESSION_CACHE_TTL, remaining)
+    with _session_cache_lock:
+        _session_cache.pop(token, None)
+        if len(_session_cache) >= _SESSION_CACHE_SIZE:
+            del _session_cache[next(iter(_session_cache))]
+        _session_cache[token] = (deadline, user)
+
+
+def _evict_session(token: Optional[str] = None) -> None:
+    """Forget a cached token, or every cached token if none is given."""
+    with _session_cache_lock:
+        if token is None:
+            _session_cache.clear()
+        else:
+            _session_cache.pop(token, None)
+
+
+# Parses "Authorization: Bearer <token>"; missing or malformed headers yield
+# None so the endpoints decide how to respond
+bearer = HTTPBearer(auto_error=False)
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)
+) -> User:
     """Extract and validate user from authorization header.
 
     Args:
-        authorization: Bearer token header
+        credentials: Bearer credentials from the Authorization header
 
     Returns:
         Authenticated User
@@ -120,15 +273,21 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
     Raises:
         HTTPException: If not authenticated
     """
-    if not authorization or not authorization.startswith("Bearer "):
+    if not credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    token = authorization.replace("Bearer ", "")
-    user = user_manager.validate_session(token)
+    token = credentials.credentials
+    user = _cached_session_user(token)
+    if user is not None:
+        return user
 
-    if not user:
+    found = user_manager.get_session_user(token)
+
+    if not found:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
+    user, expires_at = found
+    _cache_session_user(token, user, expires_at)
     return user
 
 
@@ -137,7 +296,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
 # ============================================================================
 
 @app.post("/api/auth/signup", response_model=AuthResponse)
-async def signup(request: SignupRequest):
+def signup(request: SignupRequest):
     """Register a new user account.
 
     Creates a user, session, and initializes onboarding state.
@@ -166,7 +325,7 @@ async def signup(request: SignupRequest):
 
 
 @app.post("/api/auth/login", response_model=AuthResponse)
-async def login(request: LoginRequest):
+def login(request: LoginRequest):
     """Authenticate an existing user."""
     user = user_manager.authenticate(request.email, request.password)
 
@@ -187,16 +346,19 @@ async def login(request: LoginRequest):
 
 
 @app.post("/api/auth/logout")
-async def logout(authorization: Optional[str] = Header(None)):
+def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)
+) -> Dict[str, Any]:
     """Logout and invalidate session."""
-    if authorization and authorization.startswith("Bearer "):
-        token = authorization.replace("Bearer ", "")
+    if credentials:
+        token = credentials.credentials
+        _evict_session(token)
         user_manager.invalidate_session(token)
     return {"message": "Logged out"}
 
 
 @app.get("/api/auth/me")
-async def get_me(user: User = Depends(get_current_user)):
+def get_me(user: User = Depends(get_current_user)) -> Dict[str, Any]:
     """Get current user info."""
     onboarding = onboarding_manager.get_onboarding_state(user.id)
     return {
@@ -206,9 +368,11 @@ async def get_me(user: User = Depends(get_current_user)):
 
 
 @app.get("/api/auth/verify/{token}")
-async def verify_email(token: str):
+def verify_email(token: str) -> Dict[str, Any]:
     """Verify email address using token."""
     if user_manager.verify_email(token):
+        # Cached users carry email_verified; the verified user isn't known here
+        _evict_session()
         # Get user by token and update onboarding
         # Note: We need to find the user first
         return {"message": "Email verified successfully"}
@@ -220,14 +384,14 @@ async def verify_email(token: str):
 # ============================================================================
 
 @app.get("/api/onboarding/state")
-async def get_onboarding_state(user: User = Depends(get_current_user)):
+def get_onboarding_state(user: User = Depends(get_current_user)) -> Dict[str, Any]:
     """Get current onboarding state."""
     state = onboarding_manager.get_onboarding_state(user.id)
     return state.to_dict()
 
 
 @app.get("/api/onboarding/sync")
-async def get_sync_status(user: User = Depends(get_current_user)):
+def get_sync_status(user: User = Depends(get_current_user)) -> Dict[str, Any]:
     """Get detailed sync status for all data sources."""
     return onboarding_manager.get_sync_summary(user.id)
 
@@ -237,10 +401,10 @@ async def get_sync_status(user: User = Depends(get_current_user)):
 # ============================================================================
 
 @app.post("/api/desktop/download-token")
-async def create_download_token(
+def create_download_token(
     request: DownloadRequest,
     user: User = Depends(get_current_user)
-):
+) -> Dict[str, Any]:
     """Create a download token for tracking desktop app downloads."""
     if request.platform not in ["windows", "macos", "linux"]:
         raise HTTPException(status_code=400, detail="Invalid platform")
@@ -262,7 +426,7 @@ async def create_download_token(
 
 
 @app.get("/api/desktop/download/{token}/{filename}")
-async def download_desktop_app(token: str, filename: str):
+def download_desktop_app(token: str, filename: str) -> Dict[str, Any]:
     """Download desktop app and track the download.
 
     In production, this would serve the actual installer.
@@ -283,10 +447,10 @@ async def download_desktop_app(token: str, filename: str):
 
 
 @app.post("/api/desktop/register")
-async def register_device(
+def register_device(
     request: DeviceRegistration,
     user: User = Depends(get_current_user)
-):
+) -> Dict[str, Any]:
     """Register a new desktop device after installation."""
     device = onboarding_manager.register_device(
         user_id=user.id,
@@ -294,23 +458,27 @@ async def register_device(
         platform=request.platform,
         version=request.version,
     )
+    _device_heartbeats.add_known(device.device_id)
     return device.to_dict()
 
 
 @app.post("/api/desktop/heartbeat/{device_id}")
-async def device_heartbeat(device_id: str):
-    """Update device heartbeat (called periodically by desktop app)."""
-    if onboarding_manager.update_device_heartbeat(device_id):
+def device_heartbeat(device_id: str) -> Dict[str, Any]:
+    """Update device heartbeat (called periodically by desktop app).
+
+    The timestamp is buffered and written within a couple of seconds.
+    """
+    if _device_heartbeats.record(device_id):
         return {"status": "ok"}
     raise HTTPException(status_code=404, detail="Device not found")
 
 
 @app.patch("/api/desktop/{device_id}/settings")
-async def update_device_settings(
+def update_device_settings(
     device_id: str,
     settings: DeviceSettings,
     user: User = Depends(get_current_user)
-):
+) -> Dict[str, Any]:
     """Update device capture settings."""
     success = onboarding_manager.update_device_settings(
         device_id=device_id,
@@ -328,7 +496,7 @@ async def update_device_settings(
 # ============================================================================
 
 @app.get("/api/extension/install-url")
-async def get_extension_install_url(user: User = Depends(get_current_user)):
+async def get_extension_install_url(user: User = Depends(get_current_user)) -> Dict[str, Any]:
     """Get Chrome Web Store installation URL."""
     # In production, this would be the actual Chrome Web Store URL
     return {
@@ -339,33 +507,37 @@ async def get_extension_install_url(user: User = Depends(get_current_user)):
 
 
 @app.post("/api/extension/register")
-async def register_extension(
+def register_extension(
     request: ExtensionRegistration,
     user: User = Depends(get_current_user)
-):
+) -> Dict[str, Any]:
     """Register a new browser extension after installation."""
     extension = onboarding_manager.register_extension(
         user_id=user.id,
         version=request.version,
         browser=request.browser,
     )
+    _extension_heartbeats.add_known(extension.extension_id)
     return extension.to_dict()
 
 
 @app.post("/api/extension/heartbeat/{extension_id}")
-async def extension_heartbeat(extension_id: str):
-    """Update extension heartbeat (called periodically by extension)."""
-    if onboarding_manager.update_extension_heartbeat(extension_id):
+def extension_heartbeat(extension_id: str) -> Dict[str, Any]:
+    """Update extension heartbeat (called periodically by extension).
+
+    The timestamp is buffered and written within a couple of seconds.
+    """
+    if _extension_heartbeats.record(extension_id):
         return {"status": "ok"}
     raise HTTPException(status_code=404, detail="Extension not found")
 
 
 @app.patch("/api/extension/{extension_id}/settings")
-async def update_extension_settings(
+def update_extension_settings(
     extension_id: str,
     settings: ExtensionSettings,
     user: User = Depends(get_current_user)
-):
+) -> Dict[str, Any]:
     """Update extension capture settings."""
     success = onboarding_manager.update_extension_settings(
         extension_id=extension_id,
@@ -382,13 +554,31 @@ async def update_extension_settings(
 # Onboarding UI
 # ============================================================================
 
+# The page ships with the package, so it is read and hashed once at import
+_INDEX_PATH = Path(__file__).parent / "index.html"
+try:
+    _INDEX_HTML: Optional[bytes] = _INDEX_PATH.read_bytes()
+    _INDEX_ETAG = '"%s"' % hashlib.blake2b(_INDEX_HTML, digest_size=8).hexdigest()
+except OSError:
+    _INDEX_HTML = None
+    _INDEX_ETAG = None
+
+
 @app.get("/", response_class=HTMLResponse)
-async def serve_onboarding_ui():
-    """Serve the onboarding web interface."""
-    html_path = Path(__file__).parent / "index.html"
-    if html_path.exists():
-        return HTMLResponse(content=html_path.read_text())
-    return HTMLResponse(content="<h1>Onboarding UI</h1><p>index.html not found</p>")
+async def serve_onboarding_ui(request: Request):
+    """Serve the onboarding web interface.
+
+    The page is sent from memory with an ETag, so revisits are answered
+    with 304 Not Modified.
+    """
+    if _INDEX_HTML is None:
+        return HTMLResponse(content="<h1>Onboarding UI</h1><p>index.html not found</p>")
+
+    headers = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=300"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if _INDEX_ETAG in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=_INDEX_HTML, headers=headers)
 
 
 # ============================================================================
@@ -510,9 +510,10 @@ const CaptureControlPanel = () => {
   };
 
   useEffect(() => {
-    fetchStatus();
-    const interval = setInterval(fetchStatus, 5000); // Poll every 5s
-    return () => clearInterval(interval);
+    // The server pushes status on connect and whenever a daemon changes
+    const source = new EventSource(`${API_BASE}/api/capture/status/stream`);
+    source.onmessage = (event) => setStatus(JSON.parse(event.data));
+    return () => source.close();
   }, []);
 
   const toggleDaemon = async (name: string, isRunning: boolean) => {
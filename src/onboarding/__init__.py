@@ -1,5 +1,9 @@
 """Onboarding module for managing user setup flow."""
 
-from .onboarding_manager import OnboardingManager, OnboardingState, DeviceInfo, ExtensionInfo
+from .onboarding_manager import (
+    OnboardingManager, OnboardingState, OnboardingStep, DeviceInfo, ExtensionInfo
+)
 
-__all__ = ["OnboardingManager", "OnboardingState", "DeviceInfo", "ExtensionInfo"]
+__all__ = [
+    "OnboardingManager", "OnboardingState", "OnboardingStep", "DeviceInfo", "ExtensionInfo"
+]
@@ -14,7 +14,7 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Literal
+from typing import Dict, Optional, List, Literal
 
 
 class OnboardingStep(str, Enum):
@@ -484,6 +484,37 @@ class OnboardingManager:
             conn.commit()
             return result.rowcount > 0
 
+    def update_device_heartbeats(self, last_seen: Dict[str, str]) -> int:
+        """Apply many device heartbeats in a single transaction.
+
+        Args:
+            last_seen: Last seen ISO timestamp keyed by device ID
+
+        Returns:
+            Number of devices updated
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            result = conn.executemany(
+                "UPDATE devices SET last_seen_at = ?, is_active = 1 WHERE device_id = ?",
+                [(seen_at, device_id) for device_id, seen_at in last_seen.items()]
+            )
+            conn.commit()
+            return result.rowcount
+
+    def device_exists(self, device_id: str) -> bool:
+        """Check whether a device is registered.
+
+        Args:
+            device_id: Device ID
+
+        Returns:
+            True if the device exists
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT 1 FROM devices WHERE device_id = ?", (device_id,)
+            ).fetchone() is not None
+
     def update_device_settings(
         self,
         device_id: str,
@@ -590,6 +621,37 @@ class OnboardingManager:
             conn.commit()
             return result.rowcount > 0
 
+    def update_extension_heartbeats(self, last_seen: Dict[str, str]) -> int:
+        """Apply many extension heartbeats in a single transaction.
+
+        Args:
+            last_seen: Last seen ISO timestamp keyed by extension ID
+
+        Returns:
+            Number of extensions updated
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            result = conn.executemany(
+                "UPDATE extensions SET last_seen_at = ?, is_active = 1 WHERE extension_id = ?",
+                [(seen_at, extension_id) for extension_id, seen_at in last_seen.items()]
+            )
+            conn.commit()
+            return result.rowcount
+
+    def extension_exists(self, extension_id: str) -> bool:
+        """Check whether an extension is registered.
+
+        Args:
+            extension_id: Extension ID
+
+        Returns:
+            True if the extension exists
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT 1 FROM extensions WHERE extension_id = ?", (extension_id,)
+            ).fetchone() is not None
+
     def update_extension_settings(
         self,
         extension_id: str,
@@ -27,6 +27,8 @@ Usage:
 """
 
 import sqlite3
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Literal, Any
@@ -64,6 +66,50 @@ EntityType = Literal["person", "org", "date", "money", "gpe", "product", "other"
 SourceType = Literal["screen", "clipboard", "file", "manual"]
 
 
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression that cannot fail to parse.
+
+    Each whitespace-separated word becomes a quoted string, so punctuation
+    and operator words (AND, NEAR, ...) are matched literally while the
+    words are still ANDed together. A trailing ``*`` stays a prefix query.
+
+    Args:
+        text: User search input
+
+    Returns:
+        FTS5 query string
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*') and len(word) > 1
+        if prefix:
+            word = word[:-1]
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return " ".join(terms) or '""'
+
+
+class _ConnectionHolder:
+    """Owns one thread's connection; finalized when that thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(
+    conn: sqlite3.Connection,
+    connections: list[sqlite3.Connection],
+    lock: threading.Lock,
+) -> None:
+    """Forget and close a connection whose thread has finished."""
+    with lock:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
 class SemanticStore:
     """
     Unified semantic storage layer combining all captured data.
@@ -101,6 +147,11 @@ class SemanticStore:
         self.lance_db = None
         self.lance_table = None
 
+        # One SQLite connection per thread, reused across calls
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
         self._init_models()
         self._init_database()
         self._init_vector_db()
@@ -124,9 +175,61 @@ class SemanticStore:
                 print(f"Failed to load embedding model: {e}")
                 self.embedding_model = None
 
+    def get_conn(self) -> sqlite3.Connection:
+        """
+        Get this thread's database connection, opening it on first use.
+
+        Connections stay open so SQLite's schema and page cache remain warm
+        between calls instead of being rebuilt by every connect. Each one is
+        closed when its thread exits (server worker threads come and go),
+        or by close().
+
+        Returns:
+            SQLite connection owned by the calling thread
+        """
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Reads go through a shared memory map of the database file, so
+            # the per-connection page cache (one per server worker thread)
+            # can stay small.
+            conn.execute("PRAGMA mmap_size=1073741824")
+            conn.execute("PRAGMA cache_size=-16384")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Keep ANALYZE / PRAGMA optimize to a sample of each index
+            conn.execute("PRAGMA analysis_limit=400")
+            holder = _ConnectionHolder(conn)
+            # The holder lives in this thread's locals, which are freed when
+            # the thread ends; that closes the connection with it.
+            weakref.finalize(holder, _release_connection,
+                             conn, self._connections, self._connections_lock)
+            self._local.holder = holder
+            with self._connections_lock:
+                self._connections.append(conn)
+        return holder.conn
+
+    def close(self):
+        """Close every connection opened by get_conn().
+
+        Each connection first runs PRAGMA optimize, which refreshes the
+        planner statistics of tables its queries used once they are stale.
+        """
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+        self._local = threading.local()
+
     def _init_database(self):
         """Initialize SQLite database for semantic storage."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
         # Unified semantic content table
@@ -137,11 +240,24 @@ class SemanticStore:
                 source_type TEXT NOT NULL,
                 source_id INTEGER,
                 timestamp TEXT NOT NULL,
+                timestamp_ms INTEGER,
                 metadata JSON,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Older databases only have the ISO text timestamp; add the epoch
+        # milliseconds column that range queries filter on.
+        cursor.execute("PRAGMA table_info(semantic_content)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'timestamp_ms' not in columns:
+            cursor.execute("ALTER TABLE semantic_content ADD COLUMN timestamp_ms INTEGER")
+            cursor.execute("""
+                UPDATE semantic_content SET timestamp_ms =
+                    CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000
+                    + CAST(substr(strftime('%f', timestamp), 4) AS INTEGER)
+            """)
+
         # Entity extraction table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS entities (
@@ -164,14 +280,29 @@ class SemanticStore:
             ON semantic_content(timestamp)
         """)
 
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_semantic_timestamp_ms
+            ON semantic_content(timestamp_ms)
+        """)
+
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_semantic_source
             ON semantic_content(source_type, source_id)
         """)
 
+        # Timeline filtered by source: equality column first so the range
+        # scan on timestamp_ms also yields rows already in ORDER BY order.
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_entity_type
-            ON entities(entity_type)
+            CREATE INDEX IF NOT EXISTS idx_semantic_source_ts
+            ON semantic_content(source_type, timestamp_ms)
+        """)
+
+        # Covers the per-type GROUP BY entity_text aggregation and its join
+        # column; supersedes the single-column entity_type index.
+        cursor.execute("DROP INDEX IF EXISTS idx_entity_type")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entity_type_text
+            ON entities(entity_type, entity_text, content_id)
         """)
 
         cursor.execute("""
@@ -179,6 +310,13 @@ class SemanticStore:
             ON entities(content_id)
         """)
 
+        # Mention counts per name and the mentions of a set of names
+        # (relationship graph) without touching the table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entity_text_content
+            ON entities(entity_text, content_id)
+        """)
+
         # Full-text search index
         cursor.execute("""
             CREATE VIRTUAL TABLE IF NOT EXISTS semantic_content_fts USING fts5(
@@ -188,8 +326,13 @@ class SemanticStore:
             )
         """)
 
+        # Give the planner statistics to choose between the indexes above;
+        # later refreshes are left to PRAGMA optimize in close()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+
         conn.commit()
-        conn.close()
 
     def _init_vector_db(self):
         """Initialize LanceDB for vector embeddings."""
@@ -314,21 +457,24 @@ class SemanticStore:
         Returns:
             ID of stored content
         """
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
+        timestamp_ms = int(now.timestamp()) * 1000 + now.microsecond // 1000
 
         # Store in SQLite
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
         cursor.execute("""
             INSERT INTO semantic_content
-            (content, source_type, source_id, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?)
+            (content, source_type, source_id, timestamp, timestamp_ms, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
             content,
             source_type,
             source_id,
             timestamp,
+            timestamp_ms,
             json.dumps(metadata or {})
         ))
 
@@ -360,8 +506,6 @@ class SemanticStore:
                 ))
             conn.commit()
 
-        conn.close()
-
         # Generate and store embedding
         if self.lance_table is not None:
             embedding = self._generate_embedding(content)
@@ -396,7 +540,7 @@ class SemanticStore:
         Returns:
             List of matching content
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
         if source_type:
@@ -408,7 +552,7 @@ class SemanticStore:
                 WHERE semantic_content_fts MATCH ? AND c.source_type = ?
                 ORDER BY c.timestamp DESC
                 LIMIT ?
-            """, (query, source_type, limit))
+            """, (fts_query(query), source_type, limit))
         else:
             cursor.execute("""
                 SELECT c.id, c.content, c.source_type, c.source_id,
@@ -418,7 +562,7 @@ class SemanticStore:
                 WHERE semantic_content_fts MATCH ?
                 ORDER BY c.timestamp DESC
                 LIMIT ?
-            """, (query, limit))
+            """, (fts_query(query), limit))
 
         results = []
         for row in cursor.fetchall():
@@ -431,13 +575,13 @@ class SemanticStore:
                 'metadata': json.loads(row[5]) if row[5] else {}
             })
 
-        conn.close()
         return results
 
     def semantic_search(
         self,
         query: str,
-        limit: int = 20
+        limit: int = 20,
+        query_embedding: Optional[list[float]] = None
     ) -> list[dict[str, Any]]:
         """
         Search content using semantic similarity (vector search).
@@ -445,6 +589,7 @@ class SemanticStore:
         Args:
             query: Search query
             limit: Maximum results
+            query_embedding: Embedding of query, if the caller already has it
 
         Returns:
             List of semantically similar content
@@ -454,7 +599,8 @@ class SemanticStore:
             return self.search(query, limit=limit)
 
         # Generate query embedding
-        query_embedding = self._generate_embedding(query)
+        if query_embedding is None:
+            query_embedding = self._generate_embedding(query)
         if not query_embedding:
             print("Failed to generate query embedding. Falling back to text search.")
             return self.search(query, limit=limit)
@@ -464,7 +610,7 @@ class SemanticStore:
             results = self.lance_table.search(query_embedding).limit(limit).to_list()
 
             # Enrich with full content from SQLite
-            conn = sqlite3.connect(self.db_path)
+            conn = self.get_conn()
             cursor = conn.cursor()
 
             enriched_results = []
@@ -488,7 +634,6 @@ class SemanticStore:
                         'distance': result.get('_distance', 0),
                     })
 
-            conn.close()
             return enriched_results
 
         except Exception as e:
@@ -510,13 +655,14 @@ class SemanticStore:
         Returns:
             List of entities
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
         if entity_type:
             cursor.execute("""
                 SELECT e.id, e.entity_text, e.entity_type, e.content_id,
-                       c.content, c.timestamp, c.source_type
+                       substr(c.content, 1, 200), length(c.content),
+                       c.timestamp, c.source_type
                 FROM entities e
                 JOIN semantic_content c ON e.content_id = c.id
                 WHERE e.entity_type = ?
@@ -526,7 +672,8 @@ class SemanticStore:
         else:
             cursor.execute("""
                 SELECT e.id, e.entity_text, e.entity_type, e.content_id,
-                       c.content, c.timestamp, c.source_type
+                       substr(c.content, 1, 200), length(c.content),
+                       c.timestamp, c.source_type
                 FROM entities e
                 JOIN semantic_content c ON e.content_id = c.id
                 ORDER BY c.timestamp DESC
@@ -540,12 +687,11 @@ class SemanticStore:
                 'text': row[1],
                 'type': row[2],
                 'content_id': row[3],
-                'context': row[4][:200] + "..." if len(row[4]) > 200 else row[4],
-                'timestamp': row[5],
-                'source_type': row[6],
+                'context': row[4] + "..." if row[5] > 200 else row[4],
+                'timestamp': row[6],
+                'source_type': row[7],
             })
 
-        conn.close()
         return results
 
     def get_stats(self) -> dict[str, Any]:
@@ -555,14 +701,10 @@ class SemanticStore:
         Returns:
             Dictionary of statistics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
-        # Total content
-        cursor.execute("SELECT COUNT(*) FROM semantic_content")
-        total_content = cursor.fetchone()[0]
-
-        # Content by source
+        # Content by source; the total is their sum
         cursor.execute("""
             SELECT source_type, COUNT(*)
             FROM semantic_content
@@ -570,11 +712,7 @@ class SemanticStore:
         """)
         by_source = {row[0]: row[1] for row in cursor.fetchall()}
 
-        # Total entities
-        cursor.execute("SELECT COUNT(*) FROM entities")
-        total_entities = cursor.fetchone()[0]
-
-        # Entities by type
+        # Entities by type; the total is their sum
         cursor.execute("""
             SELECT entity_type, COUNT(*)
             FROM entities
@@ -582,12 +720,10 @@ class SemanticStore:
         """)
         by_entity_type = {row[0]: row[1] for row in cursor.fetchall()}
 
-        conn.close()
-
         return {
-            'total_content': total_content,
+            'total_content': sum(by_source.values()),
             'by_source': by_source,
-            'total_entities': total_entities,
+            'total_entities': sum(by_entity_type.values()),
             'by_entity_type': by_entity_type,
             'vector_db_available': self.lance_table is not None,
             'entity_extraction_available': self.nlp is not None,
@@ -598,7 +734,7 @@ class SemanticStore:
         Sync all existing capture data into semantic store.
         This imports data from screen captures, clipboard, and file history.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_conn()
         cursor = conn.cursor()
 
         # Sync screen captures
@@ -655,5 +791,3 @@ class SemanticStore:
                     self.add(content, source_type="file", source_id=source_id)
         except sqlite3.OperationalError:
             pass  # Table doesn't exist yet
-
-        conn.close()
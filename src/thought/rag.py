@@ -3,13 +3,25 @@ RAG Engine (Retrieval Augmented Generation) for Unified AI System.
 Connects the Semantic Store (Memory) with the LLM (Brain) to answer questions about captured data.
 """
 from typing import List, Dict, Any, Optional
+import json
 import logging
+import time
+
+import numpy as np
+
 from src.store.semantic_store import SemanticStore
 from src.thought.llm_client import LLMClient
 from src.thought.router import ModelRouter
 
 logger = logging.getLogger(__name__)
 
+# A question whose embedding is at least this cosine-similar to an earlier
+# one (asked with the same limit) reuses that answer
+_ANSWER_CACHE_SIMILARITY = 0.95
+_ANSWER_CACHE_SIZE = 1024
+# Newly captured data can change the best answer, so cached ones expire
+_ANSWER_CACHE_TTL = 600.0
+
 class RAGEngine:
     """
     Engine for "Ask my Data" functionality.
@@ -27,6 +39,8 @@ class RAGEngine:
         self.store = store or SemanticStore()
         self.llm_client = llm_client or LLMClient()
         self.router = ModelRouter()
+        # (unit query vector, limit, result, monotonic time), oldest first
+        self._answer_cache: List[tuple] = []
         
     async def query(self, user_query: str, limit: int = 5) -> Dict[str, Any]:
         """
@@ -39,9 +53,21 @@ class RAGEngine:
         Returns:
             Dict containing 'answer', 'context', and 'metadata'
         """
+        # 0. Reuse the answer to a near-identical earlier question
+        query_embedding = self.store._generate_embedding(user_query)
+        query_vector = None
+        if query_embedding:
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            query_vector /= np.linalg.norm(query_vector) or 1.0
+            cached = self._cached_answer(query_vector, limit)
+            if cached is not None:
+                return cached
+
         # 1. Retrieve relevant context
         # Try semantic search first (vector), fall back to text search if needed
-        context_items = self.store.semantic_search(user_query, limit=limit)
+        context_items = self.store.semantic_search(
+            user_query, limit=limit, query_embedding=query_embedding
+        )
         
         # 2. Format context for LLM
         context_text = self._format_context(context_items)
@@ -66,8 +92,7 @@ class RAGEngine:
         
         user_prompt = f"Context:\n{context_text}\n\nQuestion: {user_query}"
         
-        user_prompt = f"Context:\n{context_text}\n\nQuestion: {user_query}"
-        
+        answered = False
         try:
             response = await self.llm_client.generate(
                 prompt=user_prompt,
@@ -75,6 +100,7 @@ class RAGEngine:
                 system=system_prompt
             )
             answer = response["content"]
+            answered = True
         except Exception as e:
             logger.error(f"RAG Generation failed: {e}")
             answer = (
@@ -84,11 +110,63 @@ class RAGEngine:
                 "Please ensure Ollama is running (`ollama serve`)."
             )
         
-        return {
+        result = {
             "answer": answer,
             "context": context_items,
             "model_used": model
         }
+        # The "LLM offline" notice is not worth remembering
+        if query_vector is not None and answered:
+            self._remember_answer(query_vector, limit, result)
+        return result
+
+    def _cached_answer(self, query_vector: np.ndarray, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Find a still-valid answer to a near-duplicate question.
+
+        An answer is only served while every content item it cites is still
+        in the store.
+
+        Args:
+            query_vector: Unit-length query embedding
+            limit: Context size the question is asked with
+
+        Returns:
+            The cached query result, or None
+        """
+        now = time.monotonic()
+        self._answer_cache = [
+            entry for entry in self._answer_cache if now - entry[3] < _ANSWER_CACHE_TTL
+        ]
+        candidates = [i for i, entry in enumerate(self._answer_cache) if entry[1] == limit]
+        if not candidates:
+            return None
+
+        similarities = np.stack([self._answer_cache[i][0] for i in candidates]) @ query_vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < _ANSWER_CACHE_SIMILARITY:
+            return None
+
+        entry = self._answer_cache.pop(candidates[best])
+        result = entry[2]
+        cited = [item["id"] for item in result["context"]]
+        if cited:
+            (present,) = self.store.get_conn().execute(
+                "SELECT COUNT(*) FROM semantic_content WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(cited),)
+            ).fetchone()
+            if present != len(set(cited)):
+                return None
+
+        # Most recently used goes last
+        self._answer_cache.append(entry)
+        return result
+
+    def _remember_answer(self, query_vector: np.ndarray, limit: int, result: Dict[str, Any]):
+        """Cache a generated answer, evicting the least recently used one."""
+        if len(self._answer_cache) >= _ANSWER_CACHE_SIZE:
+            self._answer_cache.pop(0)
+        self._answer_cache.append((query_vector, limit, result, time.monotonic()))
 
     def _format_context(self, items: List[Dict[str, Any]]) -> str:
         """Format retrieved items into a string for the prompt."""
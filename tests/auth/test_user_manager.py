@@ -229,6 +229,28 @@ class TestSessionManagement:
         assert validated_user is not None
         assert validated_user.id == user.id
 
+    def test_get_session_user_returns_expiry(self, user_manager):
+        """Test that session lookup returns the session's user and expiry."""
+        user_manager.create_user(
+            email="first@example.com",
+            name="First User",
+            password="password123",
+        )
+        user = user_manager.create_user(
+            email="test@example.com",
+            name="Test User",
+            password="password123",
+        )
+        user_manager.create_session(user.id)
+        session = user_manager.create_session(user.id)
+
+        found_user, expires_at = user_manager.get_session_user(session.token)
+
+        # Session and user ids differ here, so this checks the user's id is used
+        assert found_user.id == user.id
+        assert found_user.email == "test@example.com"
+        assert expires_at == session.expires_at
+
     def test_validate_session_invalid_token(self, user_manager):
         """Test session validation with invalid token."""
         user = user_manager.validate_session("invalid_token")
@@ -7,7 +7,7 @@ import sqlite3
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from src.capture.file_watcher import FileWatcher, FileEventHandler
+from src.capture.file_watcher import FileWatcher, FileEventHandler, format_timestamp
 
 
 @pytest.fixture
@@ -68,6 +68,28 @@ class TestFileWatcher:
 
         conn.close()
 
+    def test_hot_lookups_use_covering_indexes(self, watcher, temp_db):
+        """Test that per-file lookups are answered from an index."""
+        conn = sqlite3.connect(temp_db)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT MAX(version) FROM file_versions WHERE file_path = ?
+        """, ("/tmp/a.txt",))
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert "COVERING INDEX" in plan
+
+        cursor.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT timestamp FROM file_history
+            WHERE file_path = ? ORDER BY timestamp DESC LIMIT 1
+        """, ("/tmp/a.txt",))
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert "COVERING INDEX idx_hist_path_ts" in plan
+
+        conn.close()
+
     def test_should_ignore(self, watcher):
         """Test ignore patterns."""
         assert watcher._should_ignore(Path("/home/user/project/node_modules/package.json"))
@@ -97,6 +119,20 @@ class TestFileWatcher:
             f.write('x' * (watcher.max_file_size + 1))
         assert not watcher._should_process(large_file)
 
+    def test_should_process_reuses_stat_result(self, watcher, temp_watch_dir):
+        """Test that a provided stat result is used instead of re-stat'ing."""
+        test_file = temp_watch_dir / "test.txt"
+        test_file.write_text("test content")
+        stat_result = test_file.stat()
+
+        with patch.object(Path, 'stat', side_effect=AssertionError("unexpected stat")):
+            assert watcher._should_process(test_file, stat_result)
+
+        # A directory's stat result is rejected even with a supported suffix
+        dir_path = temp_watch_dir / "notes.txt"
+        dir_path.mkdir()
+        assert not watcher._should_process(dir_path, dir_path.stat())
+
     def test_should_not_process_unsupported_files(self, watcher, temp_watch_dir):
         """Test that unsupported file types are not processed."""
         unsupported = temp_watch_dir / "test.exe"
@@ -169,6 +205,94 @@ class TestFileWatcher:
 
         conn.close()
 
+    def test_process_file_stores_integer_timestamp(self, watcher, temp_watch_dir, temp_db):
+        """Test that event timestamps are stored as integer nanoseconds."""
+        test_file = temp_watch_dir / "stamped.txt"
+        test_file.write_text("content")
+
+        result = watcher.process_file(test_file, "created")
+        assert isinstance(result['timestamp'], int)
+
+        conn = sqlite3.connect(temp_db)
+        row = conn.execute("SELECT timestamp, typeof(timestamp) FROM file_history").fetchone()
+        conn.close()
+
+        assert row == (result['timestamp'], 'integer')
+        assert format_timestamp(row[0])[:4].isdigit()
+
+    def test_legacy_text_timestamps_migrated(self, temp_watch_dir, temp_db):
+        """Test that databases with TEXT timestamp columns are rebuilt as integers."""
+        # Schema as created before timestamps became integer nanoseconds
+        conn = sqlite3.connect(temp_db)
+        conn.executescript("""
+            CREATE TABLE file_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                content_hash TEXT,
+                content TEXT,
+                file_type TEXT,
+                file_size INTEGER,
+                metadata JSON,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX idx_file_path ON file_history(file_path);
+            CREATE INDEX idx_timestamp ON file_history(timestamp);
+            CREATE VIRTUAL TABLE file_content_fts USING fts5(
+                content, file_name, file_path,
+                content='file_history', content_rowid='id'
+            );
+            CREATE TABLE file_versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_path TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                file_size INTEGER,
+                UNIQUE(file_path, version)
+            );
+            CREATE INDEX idx_version_path ON file_versions(file_path);
+            INSERT INTO file_history (timestamp, file_path, file_name, operation, content)
+            VALUES ('2024-01-02T08:30:00.250000', '/tmp/b.txt', 'b.txt', 'created', 'legacy notes'),
+                   ('2024-01-01T12:00:00', '/tmp/a.txt', 'a.txt', 'created', NULL);
+            INSERT INTO file_content_fts(rowid, content, file_name, file_path)
+            VALUES (1, 'legacy notes', 'b.txt', '/tmp/b.txt');
+            INSERT INTO file_versions (file_path, version, content_hash, timestamp)
+            VALUES ('/tmp/b.txt', 1, 'abc', '2024-01-02T08:30:00.250000');
+        """)
+        conn.close()
+
+        watcher = FileWatcher(watch_dirs=[temp_watch_dir], db_path=temp_db)
+        test_file = temp_watch_dir / "new.txt"
+        test_file.write_text("fresh content")
+        new_event = watcher.process_file(test_file, "created")
+
+        # Reopening must leave the migrated database alone
+        FileWatcher(watch_dirs=[temp_watch_dir], db_path=temp_db)
+        watcher = FileWatcher(watch_dirs=[temp_watch_dir], db_path=temp_db)
+
+        conn = sqlite3.connect(temp_db)
+        types = conn.execute("""
+            SELECT typeof(timestamp) FROM file_history
+            UNION SELECT typeof(timestamp) FROM file_versions
+        """).fetchall()
+        history = conn.execute(
+            "SELECT file_name, timestamp FROM file_history ORDER BY timestamp"
+        ).fetchall()
+        version_ts = conn.execute("SELECT timestamp FROM file_versions").fetchone()[0]
+        conn.close()
+
+        assert types == [('integer',)]
+        assert [name for name, _ in history] == ['a.txt', 'b.txt', 'new.txt']
+        assert format_timestamp(history[0][1]) == '2024-01-01T12:00:00'
+        assert format_timestamp(history[1][1]) == '2024-01-02T08:30:00.250000'
+        assert history[2][1] == new_event['timestamp']
+        assert version_ts == history[1][1]
+        # Ids are preserved, so the external-content FTS index still resolves
+        assert [r['file_name'] for r in watcher.search("legacy")] == ['b.txt']
+
     def test_process_file_modified(self, watcher, temp_watch_dir, temp_db):
         """Test processing file modification."""
         test_file = temp_watch_dir / "modified_file.txt"
@@ -0,0 +1,653 @@
+"""
+Tests for screen capture module.
+"""
+
+import json
+import os
+import pytest
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.capture.screen_capture import ScreenCapture
+
+
+@pytest.fixture
+def temp_db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+        db_path = Path(f.name)
+    yield db_path
+    # Cleanup (including WAL sidecar files)
+    for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if path.exists():
+            path.unlink()
+
+
+@pytest.fixture
+def capture(temp_db):
+    """Create a ScreenCapture instance with temporary database."""
+    capture = ScreenCapture(db_path=temp_db)
+    yield capture
+    capture.close()
+
+
+def make_record(text: str) -> dict:
+    """Build a capture record as produced by capture_once."""
+    return {
+        'timestamp': '2024-01-01T12:00:00',
+        'screen_hash': bytes(8),
+        'extracted_text': text,
+        'active_window': 'Window',
+        'active_app': 'App',
+        'metadata': {'screen_size': (320, 200), 'text_length': len(text)},
+    }
+
+
+def make_image(seed: int, size=(320, 200)) -> Image.Image:
+    """Create a deterministic blocky test image."""
+    rng = np.random.default_rng(seed)
+    blocks = rng.integers(0, 256, size=(size[1] // 20, size[0] // 20, 3), dtype=np.uint8)
+    return Image.fromarray(blocks).resize(size, Image.NEAREST)
+
+
+class TestScreenCapture:
+    """Test suite for ScreenCapture class."""
+
+    def test_image_hash_is_64_bit_int(self, capture):
+        """Test that the perceptual hash is a 64-bit integer."""
+        h = capture._compute_image_hash(make_image(1))
+        assert isinstance(h, int)
+        assert 0 <= h < 2 ** 64
+
+    def test_image_hash_is_deterministic(self, capture):
+        """Test that identical images hash identically."""
+        assert capture._compute_image_hash(make_image(1)) == capture._compute_image_hash(make_image(1))
+
+    def test_small_change_is_not_significant(self, capture):
+        """Test that a few changed pixels stay within the Hamming threshold."""
+        image = make_image(1)
+        capture.last_hash = capture._compute_image_hash(image)
+
+        touched = image.copy()
+        touched.putpixel((5, 5), (255, 255, 255))
+        touched.putpixel((6, 5), (255, 255, 255))
+
+        assert not capture._has_significant_change(capture._compute_image_hash(touched))
+
+    def test_different_screen_is_significant(self, capture):
+        """Test that unrelated content is detected as a change."""
+        capture.last_hash = capture._compute_image_hash(make_image(1))
+        assert capture._has_significant_change(capture._compute_image_hash(make_image(2)))
+
+    def test_first_frame_is_significant(self, capture):
+        """Test that the first frame is always stored."""
+        assert capture.last_hash is None
+        assert capture._has_significant_change(0)
+
+    def test_capture_once_reuses_grabber(self, capture, temp_db):
+        """Test that one mss handle serves every capture and is closed once."""
+        frames = [make_image(1), make_image(2)]
+
+        def grab(monitor):
+            bgrx = np.asarray(frames.pop(0).convert('RGBA'))[..., [2, 1, 0, 3]]
+            return MagicMock(size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes()))
+
+        sct = MagicMock(monitors=[{}, {}], grab=MagicMock(side_effect=grab))
+        with patch('src.capture.screen_capture.mss.mss', return_value=sct) as factory, \
+                patch.object(capture, '_extract_text', return_value="hello"):
+            first = capture.capture_once()
+            second = capture.capture_once()
+            capture.close()
+
+        assert factory.call_count == 1
+        sct.close.assert_called_once()
+        assert first['screen_hash'] != second['screen_hash']
+        assert first['metadata']['screen_size'] == (320, 200)
+
+    def test_screen_hash_stored_as_blob(self, capture):
+        """Test that the 64-bit pHash is stored as 8 raw bytes."""
+        with patch.object(capture, '_get_sct') as get_sct, \
+                patch.object(capture, '_extract_text', return_value="hello"):
+            bgrx = np.asarray(make_image(1).convert('RGBA'))[..., [2, 1, 0, 3]]
+            get_sct.return_value.monitors = [{}, {}]
+            get_sct.return_value.grab.return_value = MagicMock(
+                size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes())
+            )
+            result = capture.capture_once()
+        capture.flush()
+
+        row = capture._get_conn().execute(
+            "SELECT typeof(screen_hash), length(screen_hash), screen_hash FROM captures"
+        ).fetchone()
+        assert row == ('blob', 8, result['screen_hash'])
+
+    def test_preprocess_for_ocr_binarizes_with_opencv(self, capture):
+        """Test that OpenCV preprocessing yields a binary grayscale array."""
+        pytest.importorskip("cv2")
+        prepared = capture._preprocess_for_ocr(make_image(1))
+
+        assert prepared.shape == (200, 320)
+        assert set(np.unique(prepared)) <= {0, 255}
+
+    def test_preprocess_for_ocr_without_opencv(self, capture):
+        """Test the grayscale fallback when OpenCV is not installed."""
+        with patch('src.capture.screen_capture.CV2_AVAILABLE', False):
+            prepared = capture._preprocess_for_ocr(make_image(1))
+
+        assert isinstance(prepared, Image.Image)
+        assert prepared.mode == 'L'
+
+    def test_blank_frame_skips_ocr(self, capture):
+        """Test that frames without foreground never reach tesseract."""
+        pytest.importorskip("cv2")
+        blank = Image.new('RGB', (320, 200), (40, 40, 40))
+
+        with patch('src.capture.screen_capture.pytesseract.image_to_string') as ocr:
+            assert capture._extract_text(blank) == ""
+
+        ocr.assert_not_called()
+
+    def test_text_frame_runs_ocr(self, capture):
+        """Test that a frame with sparse dark strokes is sent to OCR."""
+        pytest.importorskip("cv2")
+        page = Image.new('RGB', (320, 200), (255, 255, 255))
+        draw = ImageDraw.Draw(page)
+        for y in range(20, 180, 16):
+            for x in range(10, 300, 9):
+                draw.rectangle((x, y, x + 4, y + 6), outline=(0, 0, 0))
+
+        with patch('src.capture.screen_capture.pytesseract.image_to_string', return_value=" text \n") as ocr:
+            assert capture._extract_text(page) == "text"
+
+        ocr.assert_called_once()
+
+    def test_store_and_search_share_connection(self, capture, temp_db):
+        """Test that captures are written through one WAL-mode connection."""
+        conn = capture._get_conn()
+        capture._store_capture(make_record("quarterly revenue report"))
+        capture._store_capture(make_record("weekend hiking plans"))
+
+        assert capture._get_conn() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        results = capture.search("revenue")
+        assert [r['text'] for r in results] == ["quarterly revenue report"]
+
+        # Committed data is visible to other connections
+        other = sqlite3.connect(temp_db)
+        assert other.execute("SELECT COUNT(*) FROM captures").fetchone()[0] == 2
+        other.close()
+
+    def test_fts_follows_updates_and_deletes(self, capture):
+        """Test that triggers keep captures_fts in sync with captures."""
+        capture._store_capture(make_record("draft invoice"))
+        capture.flush()
+        conn = capture._get_conn()
+
+        with conn:
+            conn.execute("UPDATE captures SET extracted_text = 'final contract'")
+        assert capture.search("invoice") == []
+        assert len(capture.search("contract")) == 1
+
+        with conn:
+            conn.execute("DELETE FROM captures")
+        assert capture.search("contract") == []
+
+    def test_ocr_cache_matches_near_duplicates(self, capture):
+        """Test that OCR text is reused for hashes within two bits."""
+        capture._remember_text(0b1010, "cached text")
+
+        assert capture._cached_text(0b1010) == "cached text"
+        assert capture._cached_text(0b1001) == "cached text"
+        assert capture._cached_text(0b0101) is None
+
+    def test_ocr_cache_evicts_least_recently_used(self, temp_db):
+        """Test that the OCR cache stays bounded."""
+        from src.capture import screen_capture
+
+        with patch.object(screen_capture, '_OCR_CACHE_SIZE', 2):
+            capture = ScreenCapture(db_path=temp_db)
+        capture._remember_text(0xF0, "first")
+        capture._remember_text(0xF00, "second")
+        capture._cached_text(0xF0)  # touch "first"
+        capture._remember_text(0xF000, "third")
+        capture.close()
+
+        assert capture._cached_text(0xF0) == "first"
+        assert capture._cached_text(0xF000) == "third"
+        assert capture._cached_text(0xF00) is None
+
+    def test_ocr_cache_handles_high_bit_hashes(self, capture):
+        """Test that full 64-bit hashes round-trip through the cache."""
+        capture._remember_text(2 ** 64 - 1, "all ones")
+        assert capture._cached_text(2 ** 64 - 4) == "all ones"
+        assert capture._cached_text(0) is None
+
+    def test_popcount_fallback_matches_builtin(self):
+        """Test the unpackbits popcount used on NumPy < 2.0."""
+        from src.capture import screen_capture
+
+        values = np.array([0, 1, 0xFF, 2 ** 64 - 1, 0x8000000000000001], dtype=np.uint64)
+        expected = [bin(int(v)).count('1') for v in values]
+        assert list(screen_capture._popcount64(values)) == expected
+        with patch.object(screen_capture, '_HAS_BITWISE_COUNT', False):
+            assert list(screen_capture._popcount64(values)) == expected
+
+    def test_returning_screen_skips_ocr(self, capture):
+        """Test that switching back to a recently seen screen reuses its text."""
+        frames = [make_image(1), make_image(2), make_image(1)]
+
+        def grab(monitor):
+            bgrx = np.asarray(frames.pop(0).convert('RGBA'))[..., [2, 1, 0, 3]]
+            return MagicMock(size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes()))
+
+        sct = MagicMock(monitors=[{}, {}], grab=MagicMock(side_effect=grab))
+        with patch('src.capture.screen_capture.mss.mss', return_value=sct), \
+                patch.object(capture, '_extract_text', side_effect=["one", "two"]) as ocr:
+            results = [capture.capture_once() for _ in range(3)]
+
+        assert [r['extracted_text'] for r in results] == ["one", "two", "one"]
+        assert ocr.call_count == 2
+
+    def test_numba_kernel_matches_numpy_hash(self, capture):
+        """Test that the compiled pHash agrees with the NumPy implementation."""
+        pytest.importorskip("numba")
+        from src.capture import screen_capture
+
+        for seed in range(5):
+            image = make_image(seed)
+            compiled = capture._compute_image_hash(image)
+            with patch.object(screen_capture, 'NUMBA_AVAILABLE', False):
+                reference = capture._compute_image_hash(image)
+            assert bin(compiled ^ reference).count('1') <= 1
+
+    def test_captures_are_written_in_batches(self, capture, temp_db):
+        """Test that the writer thread buffers rows until the batch fills."""
+        import time
+        from src.capture import screen_capture
+
+        def stored_rows():
+            other = sqlite3.connect(temp_db)
+            count = other.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+            other.close()
+            return count
+
+        with patch.object(screen_capture, '_WRITE_BATCH_SIZE', 3), \
+                patch.object(screen_capture, '_WRITE_BATCH_MAX_AGE', 60):
+            capture._store_capture(make_record("one"))
+            capture._store_capture(make_record("two"))
+            time.sleep(0.05)
+            assert stored_rows() == 0
+
+            capture._store_capture(make_record("three"))
+            capture._write_queue.join()  # returns once the full batch is committed
+            assert stored_rows() == 3
+
+            capture._store_capture(make_record("four"))
+            capture.close()
+        assert stored_rows() == 4
+
+    def test_stale_pending_rows_are_flushed(self, capture, temp_db):
+        """Test that a partial batch is written once it is old enough."""
+        from src.capture import screen_capture
+
+        with patch.object(screen_capture, '_WRITE_BATCH_MAX_AGE', 0.05):
+            capture._store_capture(make_record("lonely"))
+            capture._write_queue.join()
+
+        other = sqlite3.connect(temp_db)
+        assert other.execute("SELECT COUNT(*) FROM captures").fetchone()[0] == 1
+        other.close()
+
+    def test_store_does_not_write_on_calling_thread(self, capture):
+        """Test that inserts happen on the background writer thread."""
+        import threading
+
+        capture._store_capture(make_record("queued"))
+        assert capture._writer is not None
+        assert capture._writer is not threading.current_thread()
+        capture.flush()
+        assert capture._write_queue.unfinished_tasks == 0
+
+    @pytest.mark.asyncio
+    async def test_run_keeps_event_loop_responsive(self, capture):
+        """Test that slow captures run off the event loop thread."""
+        import asyncio
+        import threading
+        import time
+
+        capture.capture_interval = 0
+        loop_thread = threading.get_ident()
+        capture_threads = []
+
+        def slow_capture():
+            capture_threads.append(threading.get_ident())
+            time.sleep(0.2)
+            capture.stop()
+            return None
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while capture.running:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        with patch.object(capture, 'capture_once', side_effect=slow_capture):
+            capture.running = True
+            await asyncio.gather(capture.run(), ticker())
+
+        assert capture_threads and loop_thread not in capture_threads
+        assert ticks > 5
+
+    def test_changed_region_localizes_small_change(self, capture):
+        """Test that a small change maps to a padded pixel box."""
+        base = Image.new('RGB', (640, 360), (255, 255, 255))
+        assert capture._changed_region(base) is None  # first frame
+
+        changed = base.copy()
+        ImageDraw.Draw(changed).rectangle((300, 100, 339, 119), fill=(0, 0, 0))
+        left, top, right, bottom = capture._changed_region(changed)
+
+        assert left <= 300 and top <= 100 and right >= 340 and bottom >= 120
+        assert (right - left) * (bottom - top) < 640 * 360 * 0.25
+
+    def test_changed_region_full_frame_for_large_change(self, capture):
+        """Test that large changes fall back to full-frame OCR."""
+        capture._changed_region(Image.new('RGB', (640, 360), (255, 255, 255)))
+        assert capture._changed_region(Image.new('RGB', (640, 360), (0, 0, 0))) is None
+
+    def test_small_change_only_ocrs_region(self, capture):
+        """Test that capture_once crops OCR input to the changed region."""
+        base = make_image(1, size=(640, 360))
+        changed = base.copy()
+        ImageDraw.Draw(changed).rectangle((0, 0, 150, 90), fill=(255, 255, 255))
+        frames = [base, changed]
+
+        def grab(monitor):
+            bgrx = np.asarray(frames.pop(0).convert('RGBA'))[..., [2, 1, 0, 3]]
+            return MagicMock(size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes()))
+
+        sct = MagicMock(monitors=[{}, {}], grab=MagicMock(side_effect=grab))
+        with patch('src.capture.screen_capture.mss.mss', return_value=sct), \
+                patch.object(capture, '_has_significant_change', return_value=True), \
+                patch.object(capture, '_extract_text', return_value="text") as ocr:
+            first = capture.capture_once()
+            second = capture.capture_once()
+            capture.flush()
+
+        assert ocr.call_args_list[0].args[0].size == (640, 360)
+        crop_w, crop_h = ocr.call_args_list[1].args[0].size
+        assert crop_w * crop_h <= 640 * 360 * 0.25
+        assert 'ocr_region' not in first['metadata']
+        assert second['metadata']['ocr_region'][:2] == (0, 0)
+
+    def test_fixed_metadata_stored_in_typed_columns(self, capture, temp_db):
+        """Test that screen size and text length bypass the JSON blob."""
+        record = make_record("hello")
+        record['metadata']['ocr_region'] = (0, 0, 10, 10)
+        capture._store_capture(make_record("plain"))
+        capture._store_capture(record)
+        capture.flush()
+
+        rows = capture._get_conn().execute("""
+            SELECT screen_width, screen_height, text_length, metadata
+            FROM captures ORDER BY id
+        """).fetchall()
+
+        assert rows[0] == (320, 200, 5, None)
+        assert rows[1][:3] == (320, 200, 5)
+        assert json.loads(rows[1][3]) == {'ocr_region': [0, 0, 10, 10]}
+
+    def test_legacy_metadata_migrated_to_columns(self, temp_db):
+        """Test that pre-existing JSON metadata is moved into typed columns."""
+        conn = sqlite3.connect(temp_db)
+        conn.execute("""
+            CREATE TABLE captures (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                screen_hash TEXT NOT NULL,
+                extracted_text TEXT,
+                active_window TEXT,
+                active_app TEXT,
+                metadata JSON,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            INSERT INTO captures (timestamp, screen_hash, extracted_text, metadata)
+            VALUES ('2024-01-01T12:00:00', 'abc', 'old', ?)
+        """, (json.dumps({'screen_size': [1920, 1080], 'text_length': 3}),))
+        conn.commit()
+        conn.close()
+
+        capture = ScreenCapture(db_path=temp_db)
+        row = capture._get_conn().execute(
+            "SELECT screen_width, screen_height, text_length, metadata FROM captures"
+        ).fetchone()
+        capture.close()
+
+        assert row == (1920, 1080, 3, None)
+
+    def test_interval_backs_off_when_idle(self, capture):
+        """Test that idle ticks stretch the interval and a change resets it."""
+        capture.capture_interval = 5
+        intervals = [capture._next_interval(False) for _ in range(12)]
+
+        assert intervals[:5] == [10, 20, 40, 60, 60]
+        assert intervals[-1] == 60
+
+        assert capture._next_interval(True) == 5
+        assert capture._next_interval(False) == 10
+
+    def test_interval_backoff_never_below_base(self, capture):
+        """Test that a base interval above the idle ceiling is kept as is."""
+        capture.capture_interval = 90
+
+        assert capture._next_interval(False) == 90
+        assert capture._next_interval(False) == 90
+
+    def test_window_title_cached_until_app_switch(self, capture):
+        """Test that the window list is only queried after an app activation."""
+        def app(name, pid):
+            return MagicMock(localizedName=MagicMock(return_value=name),
+                             processIdentifier=MagicMock(return_value=pid))
+
+        with patch('src.capture.screen_capture.MACOS_AVAILABLE', True), \
+                patch.object(capture, '_lookup_window_title', side_effect=["Inbox", "main.py"]) as lookup:
+            capture._set_active_app(app("Mail", 10))
+            assert capture._get_active_window() == ("Inbox", "Mail")
+            assert capture._get_active_window() == ("Inbox", "Mail")
+
+            capture._set_active_app(app("Code", 20))
+            assert capture._get_active_window() == ("main.py", "Code")
+
+        assert [c.args[0] for c in lookup.call_args_list] == [10, 20]
+
+    def test_raw_frame_hash_matches_image_hash(self, capture):
+        """Test that hashing the BGRA buffer agrees with hashing the decoded image."""
+        pytest.importorskip("cv2")
+        for seed in range(5):
+            image = make_image(seed, size=(640, 360))
+            frame = np.ascontiguousarray(np.asarray(image.convert('RGBA'))[..., [2, 1, 0, 3]])
+            distance = bin(capture._compute_image_hash(frame) ^ capture._compute_image_hash(image)).count('1')
+            assert distance <= 2
+
+    def test_unchanged_frame_is_not_decoded(self, capture):
+        """Test that frames rejected by the hash never build a PIL image."""
+        pytest.importorskip("cv2")
+        frames = [make_image(1), make_image(1)]
+
+        def grab(monitor):
+            bgrx = np.asarray(frames.pop(0).convert('RGBA'))[..., [2, 1, 0, 3]]
+            return MagicMock(size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes()))
+
+        sct = MagicMock(monitors=[{}, {}], grab=MagicMock(side_effect=grab))
+        with patch('src.capture.screen_capture.mss.mss', return_value=sct), \
+                patch.object(capture, '_extract_text', return_value="text"), \
+                patch.object(capture, '_decode_frame', wraps=capture._decode_frame) as decode:
+            assert capture.capture_once() is not None
+            assert capture.capture_once() is None
+
+        assert decode.call_count == 1
+
+    def test_tesserocr_engine_is_reused(self, capture):
+        """Test that the in-process OCR engine is created once and released on close."""
+        from src.capture import screen_capture
+
+        engine = MagicMock(GetUTF8Text=MagicMock(return_value=" words \n"))
+        api = MagicMock(return_value=engine)
+        with patch.object(screen_capture, 'TESSEROCR_AVAILABLE', True), \
+                patch.object(screen_capture, 'PyTessBaseAPI', api, create=True), \
+                patch.object(screen_capture, 'PSM', MagicMock(), create=True), \
+                patch.object(screen_capture, 'OEM', MagicMock(), create=True), \
+                patch.object(capture, '_looks_like_text', return_value=True), \
+                patch('src.capture.screen_capture.pytesseract.image_to_string') as subprocess_ocr:
+            assert capture._extract_text(make_image(1)) == "words"
+            assert capture._extract_text(make_image(2)) == "words"
+            capture.close()
+
+        assert api.call_count == 1
+        assert isinstance(engine.SetImage.call_args.args[0], Image.Image)
+        engine.End.assert_called_once()
+        subprocess_ocr.assert_not_called()
+
+    def test_search_ranks_by_relevance_with_snippets(self, capture):
+        """Test that search orders by bm25 and returns highlighted snippets."""
+        capture._store_capture(make_record("budget meeting notes and other agenda items for the week"))
+        capture._store_capture(make_record("budget budget budget review"))
+
+        results = capture.search("budget")
+
+        assert [r['text'] for r in results][0] == "budget budget budget review"
+        assert "<b>budget</b>" in results[0]['snippet']
+        assert results[1]['text'].startswith("budget meeting")
+
+    def test_grabber_is_per_thread(self, capture):
+        """Test that each thread gets its own mss handle and close releases all."""
+        import threading
+
+        handles = [MagicMock(), MagicMock()]
+        with patch('src.capture.screen_capture.mss.mss', side_effect=handles):
+            main = capture._get_sct()
+            assert capture._get_sct() is main
+
+            seen = []
+            worker = threading.Thread(target=lambda: seen.append(capture._get_sct()))
+            worker.start()
+            worker.join()
+
+        assert seen[0] is not main
+        capture.close()
+        for handle in handles:
+            handle.close.assert_called_once()
+
+    def test_min_change_bits_is_configurable(self, temp_db):
+        """Test that the Hamming threshold for storing a frame can be raised."""
+        capture = ScreenCapture(db_path=temp_db, min_change_bits=10)
+        capture.last_hash = 0
+
+        assert not capture._has_significant_change(0b111111111)
+        assert capture._has_significant_change(0b1111111111)
+        capture.close()
+
+    def test_hidpi_frames_are_downscaled_for_ocr(self, capture):
+        """Test that 4K frames are halved before OCR and 1080p frames are not."""
+        from src.capture import screen_capture
+
+        uhd = Image.new('RGB', (3840, 2160), (255, 255, 255))
+        fhd = Image.new('RGB', (1920, 1080), (255, 255, 255))
+
+        for cv2_available in (True, False):
+            if cv2_available and not screen_capture.CV2_AVAILABLE:
+                continue
+            with patch.object(screen_capture, 'CV2_AVAILABLE', cv2_available):
+                small = capture._preprocess_for_ocr(uhd)
+                full = capture._preprocess_for_ocr(fhd)
+            size = small.shape[::-1] if cv2_available else small.size
+            assert tuple(size) == (1920, 1080)
+            size = full.shape[::-1] if cv2_available else full.size
+            assert tuple(size) == (1920, 1080)
+
+    def test_window_lookup_overlaps_ocr(self, capture):
+        """Test that the active-window lookup runs while OCR is in progress."""
+        import threading
+
+        lookup_started = threading.Event()
+
+        def slow_lookup():
+            lookup_started.set()
+            return ("Editor", "Code")
+
+        def ocr(image):
+            # The lookup must already be running on another thread
+            assert lookup_started.wait(timeout=2)
+            return "text"
+
+        frame = make_image(1)
+        bgrx = np.asarray(frame.convert('RGBA'))[..., [2, 1, 0, 3]]
+        shot = MagicMock(size=(bgrx.shape[1], bgrx.shape[0]), raw=bytearray(bgrx.tobytes()))
+        sct = MagicMock(monitors=[{}, {}], grab=MagicMock(return_value=shot))
+        with patch('src.capture.screen_capture.mss.mss', return_value=sct), \
+                patch.object(capture, '_get_active_window', side_effect=slow_lookup), \
+                patch.object(capture, '_extract_text', side_effect=ocr):
+            result = capture.capture_once()
+
+        assert result['active_window'] == "Editor"
+        assert result['active_app'] == "Code"
+
+    def test_polled_window_lookup_is_cached_briefly(self, capture):
+        """Test that polled window lookups are reused within the TTL."""
+        from src.capture import screen_capture
+
+        with patch.object(screen_capture, 'MACOS_AVAILABLE', False), \
+                patch.object(capture, '_poll_active_window', side_effect=[("A", "a"), ("B", "b")]) as poll:
+            assert capture._get_active_window() == ("A", "a")
+            assert capture._get_active_window() == ("A", "a")
+            assert poll.call_count == 1
+
+            capture._window_cache = (capture._window_cache[0] - 1, capture._window_cache[1])
+            assert capture._get_active_window() == ("B", "b")
+
+    def test_linux_window_lookup_uses_xdotool(self, capture):
+        """Test the Linux lookup parses xdotool output."""
+        done = MagicMock(returncode=0, stdout="Inbox - Mail\n")
+        with patch('src.capture.screen_capture.platform.system', return_value="Linux"), \
+                patch('src.capture.screen_capture.subprocess.run', return_value=done) as run:
+            assert capture._poll_active_window() == ("Inbox - Mail", "Unknown App")
+
+        assert run.call_args.args[0][0] == 'xdotool'
+
+    @pytest.mark.skipif(not Path("/proc/self/comm").exists(), reason="requires procfs")
+    def test_linux_window_lookup_resolves_app_from_pid(self, capture):
+        """Test the chained xdotool call names the app from its PID."""
+        done = MagicMock(returncode=0, stdout=f"Inbox - Mail\n{os.getpid()}\n")
+        with patch('src.capture.screen_capture.platform.system', return_value="Linux"), \
+                patch('src.capture.screen_capture.subprocess.run', return_value=done) as run:
+            title, app_name = capture._poll_active_window()
+
+        assert run.call_count == 1
+        assert run.call_args.args[0][-1] == 'getwindowpid'
+        assert title == "Inbox - Mail"
+        assert app_name == Path(f"/proc/{os.getpid()}/comm").read_text().strip()
+
+    def test_fused_thumbnail_matches_opencv(self):
+        """Test that the compiled BGRA thumbnail matches OpenCV's area resize."""
+        pytest.importorskip("numba")
+        cv2 = pytest.importorskip("cv2")
+        from src.capture import screen_capture
+
+        frame = np.ascontiguousarray(
+            np.asarray(make_image(3, size=(640, 384)).convert('RGBA'))[..., [2, 1, 0, 3]]
+        )
+        fused = screen_capture._luma_thumbnail_kernel(frame, 32)
+        reference = cv2.cvtColor(
+            cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA), cv2.COLOR_BGRA2GRAY
+        )
+        assert np.abs(fused - reference).max() <= 1.5
@@ -229,6 +229,37 @@ class TestDeviceRegistration:
 
         assert result is False
 
+    def test_update_device_heartbeats_batch(self, onboarding_manager):
+        """Test applying several device heartbeats at once."""
+        onboarding_manager.create_onboarding(user_id=1)
+        devices = [
+            onboarding_manager.register_device(
+                user_id=1, device_name=f"Device {i}", platform="linux", version="1.0.0"
+            )
+            for i in range(2)
+        ]
+        seen_at = "2030-01-01T00:00:00"
+
+        updated = onboarding_manager.update_device_heartbeats({
+            devices[0].device_id: seen_at,
+            devices[1].device_id: seen_at,
+            "invalid_device_id": seen_at,
+        })
+
+        assert updated == 2
+        state = onboarding_manager.get_onboarding_state(1)
+        assert all(d.last_seen_at == seen_at for d in state.devices)
+
+    def test_device_exists(self, onboarding_manager):
+        """Test checking whether a device is registered."""
+        onboarding_manager.create_onboarding(user_id=1)
+        device = onboarding_manager.register_device(
+            user_id=1, device_name="Test Device", platform="linux", version="1.0.0"
+        )
+
+        assert onboarding_manager.device_exists(device.device_id) is True
+        assert onboarding_manager.device_exists("invalid_device_id") is False
+
     def test_update_device_settings(self, onboarding_manager):
         """Test updating device settings."""
         onboarding_manager.create_onboarding(user_id=1)
@@ -320,6 +351,27 @@ class TestExtensionRegistration:
 
         assert result is True
 
+    def test_update_extension_heartbeats_batch(self, onboarding_manager):
+        """Test applying several extension heartbeats at once."""
+        onboarding_manager.create_onboarding(user_id=1)
+        extension = onboarding_manager.register_extension(
+            user_id=1,
+            version="1.0.0",
+            browser="chrome",
+        )
+        seen_at = "2030-01-01T00:00:00"
+
+        updated = onboarding_manager.update_extension_heartbeats({
+            extension.extension_id: seen_at,
+            "invalid_extension_id": seen_at,
+        })
+
+        assert updated == 1
+        assert onboarding_manager.extension_exists(extension.extension_id) is True
+        assert onboarding_manager.extension_exists("invalid_extension_id") is False
+        state = onboarding_manager.get_onboarding_state(1)
+        assert state.extensions[0].last_seen_at == seen_at
+
     def test_update_extension_settings(self, onboarding_manager):
         """Test updating extension settings."""
         onboarding_manager.create_onboarding(user_id=1)
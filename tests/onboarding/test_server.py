@@ -0,0 +1,153 @@
+"""Tests for the onboarding API server."""
+
+import pytest
+import tempfile
+import time
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi.testclient import TestClient
+
+from src.auth.user_manager import UserManager
+from src.onboarding.onboarding_manager import OnboardingManager
+import src.interface.onboarding.server as server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a test client backed by managers with temporary databases."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setattr(server, "user_manager", UserManager(db_path=Path(tmpdir) / "users.db"))
+        monkeypatch.setattr(
+            server, "onboarding_manager", OnboardingManager(db_path=Path(tmpdir) / "onboarding.db")
+        )
+        monkeypatch.setattr(server, "_session_cache", {})
+        yield TestClient(server.app)
+
+
+def signup(client, email="test@example.com"):
+    """Sign up a user and return the auth headers for its session."""
+    res = client.post("/api/auth/signup", json={
+        "email": email,
+        "name": "Test User",
+        "password": "password123",
+    })
+    assert res.status_code == 200
+    return {"Authorization": f"Bearer {res.json()['token']}"}
+
+
+class TestSessionCache:
+    """Test validated-session caching in get_current_user."""
+
+    def test_logout_rejects_token_immediately(self, client):
+        """Test that a cached session stops working as soon as it logs out."""
+        headers = signup(client)
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        client.post("/api/auth/logout", headers=headers)
+
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_expired_session_refused(self, client):
+        """Test that an expired session is refused even after being cached."""
+        user = server.user_manager.create_user(
+            email="test@example.com",
+            name="Test User",
+            password="password123",
+        )
+        session = server.user_manager.create_session(user.id, duration_hours=1 / 3600)
+        headers = {"Authorization": f"Bearer {session.token}"}
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        time.sleep(1.1)
+
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+@pytest.fixture
+def heartbeats(client, monkeypatch):
+    """Route device heartbeats through a fresh buffer whose writes are recorded."""
+    manager = server.onboarding_manager
+    writes = []
+
+    def write(last_seen):
+        writes.append(dict(last_seen))
+        return manager.update_device_heartbeats(last_seen)
+
+    buffer = server._HeartbeatBuffer(manager.device_exists, write)
+    monkeypatch.setattr(server, "_device_heartbeats", buffer)
+    return buffer, writes
+
+
+def register_device(name="Test Device"):
+    """Register a device for user 1 and return it."""
+    server.onboarding_manager.create_onboarding(user_id=1)
+    return server.onboarding_manager.register_device(
+        user_id=1, device_name=name, platform="linux", version="1.0.0"
+    )
+
+
+def last_seen(device_id):
+    """Read a device's stored last_seen_at."""
+    state = server.onboarding_manager.get_onboarding_state(1)
+    return next(d.last_seen_at for d in state.devices if d.device_id == device_id)
+
+
+class TestHeartbeatBuffer:
+    """Test heartbeat coalescing in the onboarding server."""
+
+    def test_unknown_id_rejected_without_write(self, client, heartbeats):
+        """Test that an unregistered device gets 404 and nothing is buffered."""
+        buffer, writes = heartbeats
+
+        res = client.post("/api/desktop/heartbeat/invalid_device_id")
+
+        assert res.status_code == 404
+        assert buffer.flush() == 0
+        assert writes == []
+
+    def test_record_keeps_latest_timestamp(self, client, heartbeats):
+        """Test that repeated heartbeats keep only the newest timestamp."""
+        buffer, writes = heartbeats
+        device = register_device()
+
+        assert buffer.record(device.device_id) is True
+        first = buffer._pending[device.device_id]
+        time.sleep(0.01)
+        assert buffer.record(device.device_id) is True
+
+        assert list(buffer._pending) == [device.device_id]
+        assert buffer._pending[device.device_id] > first
+
+    def test_flush_writes_one_batch_and_empties(self, client, heartbeats):
+        """Test that a flush applies all buffered heartbeats in one write."""
+        buffer, writes = heartbeats
+        devices = [register_device(f"Device {i}") for i in range(2)]
+        for device in devices:
+            client.post(f"/api/desktop/heartbeat/{device.device_id}")
+        pending = dict(buffer._pending)
+
+        assert buffer.flush() == 2
+
+        assert writes == [pending]
+        assert buffer._pending == {}
+        assert all(last_seen(d.device_id) == pending[d.device_id] for d in devices)
+        assert buffer.flush() == 0
+        assert len(writes) == 1
+
+    def test_shutdown_flushes_buffered_heartbeats(self, client, heartbeats, monkeypatch):
+        """Test that heartbeats still buffered at shutdown are written."""
+        buffer, writes = heartbeats
+        monkeypatch.setattr(server, "_HEARTBEAT_FLUSH_INTERVAL", 3600)
+        device = register_device()
+        registered_at = last_seen(device.device_id)
+
+        with TestClient(server.app) as running:
+            time.sleep(0.01)
+            assert running.post(f"/api/desktop/heartbeat/{device.device_id}").status_code == 200
+            assert last_seen(device.device_id) == registered_at
+
+        assert len(writes) == 1
+        assert last_seen(device.device_id) > registered_at
@@ -13,6 +13,7 @@ import sqlite3
 from pathlib import Path
 import tempfile
 import shutil
+import threading
 from datetime import datetime
 
 from src.store.semantic_store import SemanticStore
@@ -35,7 +36,9 @@ def temp_db_path():
 def store(temp_db_path):
     """Create a semantic store instance for testing."""
     db_path, vector_path = temp_db_path
-    return SemanticStore(db_path=db_path, vector_db_path=vector_path)
+    store = SemanticStore(db_path=db_path, vector_db_path=vector_path)
+    yield store
+    store.close()
 
 
 class TestSemanticStore:
@@ -134,6 +137,18 @@ class TestSemanticStore:
         assert len(results) == 1
         assert results[0]['source_type'] == "clipboard"
 
+    def test_search_tolerates_fts_syntax(self, store):
+        """Test that punctuation and operator words are matched literally."""
+        store.add("What was Q1 revenue? John's deal closed", source_type="manual")
+        store.add("Revenue AND costs", source_type="manual")
+
+        assert len(store.search("revenue?")) == 2
+        assert len(store.search("John's deal")) == 1
+        assert len(store.search('"unbalanced')) == 0
+        assert len(store.search("AND")) == 1
+        assert len(store.search("reven*")) == 2
+        assert store.search("   ") == []
+
     def test_entity_extraction(self, store):
         """Test entity extraction from content."""
         # This test may be skipped if spaCy is not available
@@ -282,6 +297,130 @@ class TestSemanticStore:
             assert source in stats['by_source']
             assert stats['by_source'][source] == 1
 
+    def test_add_stores_epoch_milliseconds(self, store):
+        """Test that added content gets a timestamp_ms matching its ISO timestamp."""
+        store.add("timed", source_type="manual")
+
+        timestamp, timestamp_ms = store.get_conn().execute(
+            "SELECT timestamp, timestamp_ms FROM semantic_content"
+        ).fetchone()
+        expected = datetime.fromisoformat(timestamp)
+        assert timestamp_ms == int(expected.timestamp()) * 1000 + expected.microsecond // 1000
+
+    def test_legacy_timestamps_backfilled(self, temp_db_path):
+        """Test that databases without timestamp_ms are migrated on open."""
+        db_path, vector_path = temp_db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE semantic_content (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                source_type TEXT NOT NULL,
+                source_id INTEGER,
+                timestamp TEXT NOT NULL,
+                metadata JSON,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO semantic_content (content, source_type, timestamp) VALUES (?, ?, ?)",
+            ("old", "manual", "2024-03-05T14:07:09.250000"),
+        )
+        conn.commit()
+        conn.close()
+
+        store = SemanticStore(db_path=db_path, vector_db_path=vector_path)
+        timestamp_ms = store.get_conn().execute(
+            "SELECT timestamp_ms FROM semantic_content"
+        ).fetchone()[0]
+        store.close()
+
+        assert timestamp_ms == int(datetime(2024, 3, 5, 14, 7, 9, 250000).timestamp() * 1000)
+
+    def test_connection_reused_per_thread(self, store):
+        """Test that each thread keeps one WAL connection across calls."""
+        conn = store.get_conn()
+        store.add("first", source_type="manual")
+        store.search("first")
+
+        assert store.get_conn() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(store.get_conn()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+        store.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert store.get_conn() is not conn
+
+    def test_connections_closed_when_threads_exit(self, store):
+        """Test that short-lived worker threads don't leak connections."""
+        conns = []
+
+        def worker():
+            conn = store.get_conn()
+            conn.execute("SELECT 1")
+            conns.append(conn)
+
+        for _ in range(50):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert len(set(map(id, conns))) == 50
+        assert len(store._connections) <= 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            conns[0].execute("SELECT 1")
+
+    def test_planner_statistics_maintained(self, temp_db_path):
+        """Test that a new database is analyzed and close() runs optimize."""
+        db_path, vector_path = temp_db_path
+        store = SemanticStore(db_path=db_path, vector_db_path=vector_path)
+        conn = store.get_conn()
+        assert conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone() is not None
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        store.close()
+        assert "PRAGMA optimize" in statements
+
+    def test_hot_queries_use_composite_indexes(self, store):
+        """Test that timeline and entity aggregation avoid table scans."""
+        conn = store.get_conn()
+
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id FROM semantic_content
+            WHERE timestamp_ms >= ? AND source_type = ?
+            ORDER BY timestamp_ms DESC, id DESC LIMIT 10
+        """, (0, "manual")).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_semantic_source_ts" in details
+        assert "TEMP B-TREE" not in details
+
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT entity_text, COUNT(*) FROM entities
+            WHERE entity_type = ? GROUP BY entity_text
+        """, ("person",)).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "COVERING INDEX idx_entity_type_text" in details
+
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT content_id, entity_text FROM entities
+            WHERE entity_text IN ('a', 'b')
+        """).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "COVERING INDEX idx_entity_text_content" in details
+
 
 class TestCLI:
     """Test CLI functionality (basic validation)."""
@@ -55,3 +55,72 @@ class TestLLMClient:
         
         assert "Stub response" in result["content"]
         assert result["provider"] == "cloud_stub"
+
+class TestRAGEngine:
+    """Tests for RAGEngine answer caching."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        from src.store.semantic_store import SemanticStore
+        store = SemanticStore(db_path=tmp_path / "capture.db", vector_db_path=tmp_path / "lancedb")
+        # Fixed embeddings: the two revenue questions are near-duplicates
+        vectors = {
+            "Q1 revenue": [1.0, 0.0, 0.0],
+            "q1 revenue": [0.99, 0.05, 0.0],
+            "Alice": [0.0, 1.0, 0.0],
+        }
+        store._generate_embedding = lambda text: vectors.get(text)
+        yield store
+        store.close()
+
+    @pytest.fixture
+    def llm_client(self):
+        client = AsyncMock()
+        client.generate.return_value = {"content": "Revenue was $500K"}
+        return client
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_question_reuses_answer(self, store, llm_client):
+        """Test that a near-identical question skips retrieval and generation."""
+        from src.thought.rag import RAGEngine
+        store.add("Q1 revenue was $500K", extract_entities=False)
+        engine = RAGEngine(store=store, llm_client=llm_client)
+
+        first = await engine.query("Q1 revenue")
+        second = await engine.query("q1 revenue")
+
+        assert second is first
+        assert llm_client.generate.await_count == 1
+
+        await engine.query("Alice")
+        assert llm_client.generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_answer_dropped_when_cited_content_is_gone(self, store, llm_client):
+        """Test that cached answers citing deleted content are regenerated."""
+        from src.thought.rag import RAGEngine
+        content_id = store.add("Q1 revenue was $500K", extract_entities=False)
+        engine = RAGEngine(store=store, llm_client=llm_client)
+
+        first = await engine.query("Q1 revenue")
+        assert [item["id"] for item in first["context"]] == [content_id]
+
+        conn = store.get_conn()
+        conn.execute("DELETE FROM semantic_content WHERE id = ?", (content_id,))
+        conn.commit()
+
+        await engine.query("q1 revenue")
+        assert llm_client.generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_not_cached(self, store, llm_client):
+        """Test that the LLM-offline fallback answer is not reused."""
+        from src.thought.rag import RAGEngine
+        llm_client.generate.side_effect = [ConnectionError("offline"), {"content": "ok"}]
+        engine = RAGEngine(store=store, llm_client=llm_client)
+
+        await engine.query("Q1 revenue")
+        result = await engine.query("Q1 revenue")
+
+        assert result["answer"] == "ok"
+        assert llm_client.generate.await_count == 2